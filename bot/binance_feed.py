@@ -33,6 +33,8 @@ class BinanceFeed:
         self._ws = None
         # Rolling price buffer: last 10 seconds of ticks
         self.price_buffer: collections.deque = collections.deque(maxlen=500)
+        # Pulsed on every trade tick so strategies can wake event-driven
+        self.price_event = asyncio.Event()
 
     def get_price_n_seconds_ago(self, n: float) -> Optional[float]:
         """Return the price from approximately `n` seconds ago."""
@@ -129,6 +131,7 @@ class BinanceFeed:
                         self.current_price = float(msg["p"])
                         self.last_update = now
                         self.price_buffer.append((now, self.current_price))
+                        self.price_event.set()
             except (websockets.ConnectionClosed, ConnectionError, OSError) as exc:
                 log.warning("Binance WS disconnected (%s), reconnecting in 2s...", exc)
                 await asyncio.sleep(2)
@@ -83,7 +83,7 @@ def build_dashboard(feed: BinanceFeed, strat: Strategy) -> Layout:
     pos_table.add_column("P&L %", justify="right")
     pos_table.add_column("Age", justify="right", style="dim")
 
-    for pos in strat._open_positions:
+    for pos in strat._open_positions.values():
         age_s = int(time.time() - pos.entry_time)
         age_str = f"{age_s}s"
         pos_table.add_row(
@@ -101,7 +101,7 @@ def build_dashboard(feed: BinanceFeed, strat: Strategy) -> Layout:
     closed_table.add_column("Entry", justify="right")
     closed_table.add_column("Exit", justify="right")
     closed_table.add_column("PnL", justify="right")
-    for pos in strat._closed_positions[-5:]:
+    for pos in list(strat._closed_positions)[-5:]:
         pnl_str = f"${pos.pnl:+.2f}" if pos.pnl is not None else "--"
         pnl_style = "green" if (pos.pnl or 0) >= 0 else "red"
         closed_table.add_row(
@@ -291,6 +291,11 @@ def cli():
     parser.add_argument("--test-inverse", action="store_true", help="INVERSE TEST: same rules flipped (underdog), dry run, all day, dashboard port 8897")
     parser.add_argument("--test-perfect", action="store_true", help="PERFECT TEST: safer S3 with chaos filters, dry run, all day, dashboard port 8896")
     args = parser.parse_args()
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # fine on Windows / without uvloop; stdlib loop works the same
     asyncio.run(
         main(
             headless=args.headless,
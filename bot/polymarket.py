@@ -8,6 +8,7 @@ Handles:
 """
 
 import asyncio
+import json
 import logging
 import time
 import math
@@ -15,9 +16,26 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 import aiohttp
+import websockets
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is fine
+    orjson = None
 
 from bot.config import cfg
 
+
+def _json_loads(data):
+    """Parse JSON from bytes/str, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+BID_CACHE_TTL_SEC = 0.25  # adjacent ticks reuse a quote this fresh
+MARKETS_CACHE_TTL_SEC = 25.0  # strategies share one discovery result this long
+CLOB_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
 log = logging.getLogger("polymarket")
 
 # ---------------------------------------------------------------------------
@@ -42,9 +60,11 @@ class Market:
     no_ask: float = 0.0
     # active flag
     active: bool = True
+    # pre-truncated question for logs/dashboard (avoids re-slicing every tick)
+    question_short: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """A position we hold in a market."""
     market: Market
@@ -81,17 +101,49 @@ class PolymarketClient:
         self._headers: Dict[str, str] = {}
         self._api_creds_loaded = False
         self.balance_usdc: Optional[float] = None  # cached for dashboard
+        # In-flight bid fetches keyed by token_id (request coalescing)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Short-TTL bid cache: token_id -> (monotonic ts, bid). Adjacent
+        # ticks reuse a fresh quote instead of re-hitting the API.
+        self._bid_cache: Dict[str, tuple] = {}
+        # Discovery delta cache: skip re-parsing unchanged API payloads
+        self._discovery_hash = 0
+        self._discovery_cache: List[Market] = []
+        self._markets_cache: tuple = (0.0, None)  # (monotonic_ts, markets)
+        self._markets_task: Optional[asyncio.Task] = None
+        # Conditional-GET state per discovery URL: etag + last body
+        self._etags: Dict[str, tuple] = {}
+        # Streaming best bids from the CLOB market WebSocket
+        self._bids: Dict[str, float] = {}
+        self._asks: Dict[str, float] = {}
+        self._book_levels: Dict[str, tuple] = {}  # token -> ({bid px: sz}, {ask px: sz})
+        self._stream_tokens: set = set()
+        # Subscriber count per token: several strategies share this client
+        # and trade the same markets, so a token stays subscribed until the
+        # last strategy lets go of it.
+        self._stream_refs: Dict[str, int] = {}
+        self._stream_task: Optional[asyncio.Task] = None
+        self._stream_resub = False  # token set changed mid-connection
+        self.bid_event = asyncio.Event()  # pulsed on every streamed update
 
     # ------------------------------------------------------------------
     # lifecycle
     # ------------------------------------------------------------------
 
     async def start(self):
-        self._session = aiohttp.ClientSession()
+        # One pooled session for the client's lifetime: keep-alive avoids
+        # a TCP+TLS handshake on every quote/order call.
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, keepalive_timeout=60))
+        self._stream_task = asyncio.create_task(self._book_stream_loop())
         if not cfg.dry_run:
             await self._init_clob_client()
 
     async def stop(self):
+        if self._stream_task:
+            self._stream_task.cancel()
+            self._stream_task = None
         if self._session:
             await self._session.close()
 
@@ -133,21 +185,44 @@ class PolymarketClient:
     # ------------------------------------------------------------------
 
     async def find_active_btc_5min_markets(self) -> List[Market]:
+        """
+        Discover active BTC 5-minute markets, shared across strategies.
+
+        Each strategy polls on its own cadence; a short shared TTL plus
+        in-flight coalescing means N strategies cost one Gamma round-trip
+        per window instead of N identical ones.
+        """
+        ts, cached = self._markets_cache
+        if cached is not None and time.monotonic() - ts < MARKETS_CACHE_TTL_SEC:
+            return cached
+        task = self._markets_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._fetch_active_btc_5min_markets())
+            self._markets_task = task
+        markets = await task
+        return markets
+
+    async def _fetch_active_btc_5min_markets(self) -> List[Market]:
         """
         Discover active BTC 5-minute markets using two methods:
           1. Slug-based lookup (btc-updown-5m-{epoch}) -- most reliable
           2. Keyword search fallback ("bitcoin" + "up or down")
+
+        Unchanged API payloads short-circuit to the previous parse result,
+        so back-to-back discovery cycles don't rebuild identical markets.
         """
-        import json as _json
         from datetime import datetime as _dt
 
         markets: List[Market] = []
         seen_cids: set = set()
+        slug_payloads: List[bytes] = []
+        keyword_payload: bytes = b""
         now = time.time()
 
-        # ── Method 1: Slug-based (current + next 2 windows) ──
-        # The bot re-discovers every 30s, so we only need to stay
-        # 1-2 windows ahead. This keeps API calls low (3 per cycle).
+        # ── Fetch phase ──
+        # Method 1: slug-based (current + next 2 windows). The bot
+        # re-discovers every 30s, so we only need to stay 1-2 windows
+        # ahead. This keeps API calls low (3 per cycle).
         try:
             current_slot = (int(now) // 300) * 300
             for offset in range(0, 3):  # current, next, next+1
@@ -155,10 +230,41 @@ class PolymarketClient:
                 slug = f"btc-updown-5m-{epoch}"
                 url = f"{self.GAMMA_API}/events?slug={slug}"
                 try:
-                    async with self._session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                        events = await resp.json()
+                    slug_payloads.append(await self._conditional_get(url, 5))
                 except Exception:
                     continue
+        except Exception as exc:
+            log.warning("Slug-based discovery error: %s", exc)
+
+        # Method 2: keyword fallback payload
+        try:
+            params = {
+                "closed": "false",
+                "limit": "100",
+                "order": "startDate",
+                "ascending": "false",
+            }
+            from urllib.parse import urlencode
+            url = f"{self.GAMMA_API}/markets?{urlencode(params)}"
+            keyword_payload = await self._conditional_get(url, 10)
+        except Exception as exc:
+            log.warning("Keyword discovery error: %s", exc)
+
+        # ── Delta check: identical payloads mean identical markets ──
+        payload_hash = hash(b"\x00".join(slug_payloads) + b"\x01" + keyword_payload)
+        if payload_hash == self._discovery_hash and self._discovery_cache:
+            cached = [m for m in self._discovery_cache if m.window_end >= now]
+            self._markets_cache = (time.monotonic(), cached)
+            log.debug("Discovery payloads unchanged; reusing %d cached markets", len(cached))
+            return cached
+
+        # ── Parse phase ──
+        try:
+            for raw in slug_payloads:
+                try:
+                    events = _json_loads(raw)
+                except ValueError:
+                    continue
                 if not events:
                     continue
                 for m in events[0].get("markets", []):
@@ -166,7 +272,7 @@ class PolymarketClient:
                     if cid in seen_cids:
                         continue
                     raw_tokens = m.get("clobTokenIds", "[]")
-                    tokens = _json.loads(raw_tokens) if isinstance(raw_tokens, str) else raw_tokens
+                    tokens = _json_loads(raw_tokens) if isinstance(raw_tokens, str) else raw_tokens
                     if len(tokens) < 2:
                         continue
                     end_str = m.get("endDate", "")
@@ -186,23 +292,14 @@ class PolymarketClient:
                     mkt.window_end = end_ts
                     mkt.window_start = end_ts - 300
                     mkt.reference_price = self._parse_reference_price(m.get("question", ""))
+                    mkt.question_short = mkt.question[:70]
                     markets.append(mkt)
                     seen_cids.add(cid)
         except Exception as exc:
-            log.warning("Slug-based discovery error: %s", exc)
+            log.warning("Slug-based discovery parse error: %s", exc)
 
-        # ── Method 2: Keyword fallback ──
         try:
-            params = {
-                "closed": "false",
-                "limit": "100",
-                "order": "startDate",
-                "ascending": "false",
-            }
-            url = f"{self.GAMMA_API}/markets"
-            async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                data = await resp.json()
-
+            data = _json_loads(keyword_payload) if keyword_payload else []
             for item in data:
                 title = item.get("question", "").lower()
                 cid = item.get("conditionId", item.get("condition_id", ""))
@@ -216,7 +313,7 @@ class PolymarketClient:
                 if not is_btc_5min:
                     continue
                 raw_tokens = item.get("clobTokenIds", item.get("clob_token_ids", "[]"))
-                tokens = _json.loads(raw_tokens) if isinstance(raw_tokens, str) else (raw_tokens if isinstance(raw_tokens, list) else [])
+                tokens = _json_loads(raw_tokens) if isinstance(raw_tokens, str) else (raw_tokens if isinstance(raw_tokens, list) else [])
                 if len(tokens) < 2:
                     continue
                 end_date = item.get("endDate", "")
@@ -239,25 +336,58 @@ class PolymarketClient:
                 mkt.window_end = end_ts
                 mkt.window_start = end_ts - 300
                 mkt.reference_price = self._parse_reference_price(item.get("question", ""))
+                mkt.question_short = mkt.question[:70]
                 markets.append(mkt)
                 seen_cids.add(cid)
         except Exception as exc:
-            log.warning("Keyword discovery error: %s", exc)
+            log.warning("Keyword discovery parse error: %s", exc)
 
+        self._discovery_hash = payload_hash
+        self._discovery_cache = markets
+        self._markets_cache = (time.monotonic(), markets)
         log.info("Found %d active BTC 5-min markets", len(markets))
         return markets
 
+    async def _conditional_get(self, url: str, timeout_sec: float) -> bytes:
+        """GET with If-None-Match; a 304 reuses the cached body (no parse,
+        no transfer). Gamma returns ETags on the discovery endpoints."""
+        headers = {}
+        cached = self._etags.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        async with self._session.get(
+                url, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout_sec)) as resp:
+            if resp.status == 304 and cached:
+                return cached[1]
+            body = await resp.read()
+            etag = resp.headers.get("ETag")
+            if etag:
+                self._etags[url] = (etag, body)
+                # 5-minute slug URLs churn; keep the map from growing
+                if len(self._etags) > 64:
+                    self._etags.pop(next(iter(self._etags)))
+            return body
+
     async def get_market_prices(self, market: Market) -> None:
-        """Fetch current best-ask for YES and NO on a market."""
+        """Fetch current best-ask for YES and NO on a market.
+
+        Streamed asks (when the tokens are subscribed to the book WebSocket)
+        are used directly; REST only covers the sides the stream lacks.
+        """
         try:
             url = f"{cfg.poly_clob_host}/book"
             for side, token_id, attr in [
                 ("YES", market.yes_token_id, "yes_ask"),
                 ("NO", market.no_token_id, "no_ask"),
             ]:
+                streamed = self._asks.get(token_id)
+                if streamed is not None:
+                    setattr(market, attr, streamed)
+                    continue
                 params = {"token_id": token_id}
                 async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                    book = await resp.json()
+                    book = _json_loads(await resp.read())
                 asks = book.get("asks", [])
                 if asks:
                     best = min(asks, key=lambda a: float(a.get("price", "999")))
@@ -317,6 +447,7 @@ class PolymarketClient:
             result = self._clob_client.post_order(signed, OrderType.GTC)
             pos.order_id = result.get("orderID", result.get("id", ""))
             pos.filled = result.get("status", "") == "matched"
+            self._bid_cache.pop(token_id, None)
             log.info(
                 "[LIVE] BUY %s %.2f shares @ $%.4f | order=%s status=%s",
                 side, qty, ask_price, pos.order_id, result.get("status"),
@@ -364,6 +495,7 @@ class PolymarketClient:
             )
             signed = self._clob_client.create_order(order_args)
             result = self._clob_client.post_order(signed, OrderType.GTC)
+            self._bid_cache.pop(position.token_id, None)
             pnl = (bid_price - position.avg_entry) * position.qty
             position.exit_price = bid_price
             position.pnl = pnl
@@ -440,19 +572,307 @@ class PolymarketClient:
         except Exception as exc:
             log.debug("Data API value failed: %s", exc)
 
+    async def get_best_bids_batch(self, token_ids: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch best bids for many tokens in one CLOB request.
+
+        Uses the batch /prices endpoint so N open positions cost one HTTP
+        round-trip instead of N. Falls back to per-token /book fetches if
+        the batch call fails.
+        """
+        # Callers may pass sibling tokens of the same market twice; dedupe
+        # while preserving order so the request body stays minimal.
+        token_ids = list(dict.fromkeys(token_ids))
+        result: Dict[str, Optional[float]] = {t: None for t in token_ids}
+        if not token_ids:
+            return result
+        try:
+            url = f"{cfg.poly_clob_host}/prices"
+            body = [{"token_id": t, "side": "BUY"} for t in token_ids]
+            async with self._session.post(url, json=body, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                data = _json_loads(await resp.read())
+            # Response shape: {token_id: {"BUY": "0.55"}, ...}
+            mono = time.monotonic()
+            for token_id in token_ids:
+                entry = data.get(token_id)
+                if isinstance(entry, dict):
+                    price = entry.get("BUY")
+                    if price is not None:
+                        result[token_id] = float(price)
+                self._bid_cache[token_id] = (mono, result[token_id])
+            return result
+        except Exception as exc:
+            log.warning("Batch bid fetch failed (%d tokens): %s — falling back to /book", len(token_ids), exc)
+        bids = await asyncio.gather(
+            *(self._get_best_bid(t) for t in token_ids), return_exceptions=True)
+        for token_id, bid in zip(token_ids, bids):
+            result[token_id] = bid if not isinstance(bid, BaseException) else None
+        return result
+
+    async def get_books_batch(self, token_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Fetch order books for many tokens in one CLOB request.
+
+        POSTs the batch /books endpoint and returns
+        {token_id: (best_bid, best_ask)} with None for sides without a
+        priced level. Best bids also refresh the short REST cache.
+        """
+        token_ids = list(dict.fromkeys(token_ids))
+        result: Dict[str, tuple] = {}
+        if not token_ids:
+            return result
+        try:
+            url = f"{cfg.poly_clob_host}/books"
+            body = [{"token_id": t} for t in token_ids]
+            async with self._session.post(url, json=body, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                books = _json_loads(await resp.read())
+            mono = time.monotonic()
+            for book in books if isinstance(books, list) else []:
+                token = book.get("asset_id")
+                if not token:
+                    continue
+                best_bid = None
+                for lvl in book.get("bids", []):
+                    try:
+                        if float(lvl.get("size", 0)) > 0:
+                            price = float(lvl.get("price", 0))
+                            if best_bid is None or price > best_bid:
+                                best_bid = price
+                    except (TypeError, ValueError):
+                        continue
+                best_ask = None
+                for lvl in book.get("asks", []):
+                    try:
+                        if float(lvl.get("size", 0)) > 0:
+                            price = float(lvl.get("price", 0))
+                            if best_ask is None or price < best_ask:
+                                best_ask = price
+                    except (TypeError, ValueError):
+                        continue
+                result[token] = (best_bid, best_ask)
+                self._bid_cache[token] = (mono, best_bid)
+        except Exception as exc:
+            log.warning("Batch book fetch failed (%d tokens): %s", len(token_ids), exc)
+        return result
+
+    # ------------------------------------------------------------------
+    # CLOB book stream (WebSocket)
+    # ------------------------------------------------------------------
+
+    def streamed_bid(self, token_id: str) -> Optional[float]:
+        """Latest best bid from the book stream, or None if not streaming."""
+        return self._bids.get(token_id)
+
+    def streamed_ask(self, token_id: str) -> Optional[float]:
+        """Latest best ask from the book stream, or None if not streaming."""
+        return self._asks.get(token_id)
+
+    def mirrored_bid(self, token_id: str, opp_token_id: str) -> Optional[float]:
+        """
+        Best bid for token_id, using the opposite outcome's streamed ask as
+        a stand-in when the direct bid isn't streaming.
+
+        The CLOB mirrors binary books (best NO bid == 1 - best YES ask), so
+        the complement carries the same information. A direct bid always
+        wins; a >1c disagreement between the two is logged as genuine
+        one-sided liquidity rather than papered over.
+        """
+        direct = self._bids.get(token_id)
+        opp_ask = self._asks.get(opp_token_id)
+        if opp_ask is None:
+            return direct
+        derived = round(1.0 - opp_ask, 4)
+        if direct is None:
+            return derived
+        if abs(direct - derived) > 0.01 and log.isEnabledFor(logging.DEBUG):
+            log.debug("Mirrored-book mismatch %s…: bid %.3f vs 1-ask %.3f",
+                      token_id[:8], direct, derived)
+        return direct
+
+    def subscribe_bids(self, token_ids: List[str]):
+        """Start streaming best bids for these tokens (ref-counted)."""
+        for token_id in dict.fromkeys(token_ids):
+            self._stream_refs[token_id] = self._stream_refs.get(token_id, 0) + 1
+        new = set(token_ids) - self._stream_tokens
+        if new:
+            self._stream_tokens |= new
+            self._stream_resub = True
+
+    def unsubscribe_bids(self, token_ids: List[str]):
+        """Drop one subscription per token; book state is only cleared when
+        the last subscriber lets go (stale subs drop on next reconnect)."""
+        for token_id in dict.fromkeys(token_ids):
+            refs = self._stream_refs.get(token_id, 0) - 1
+            if refs > 0:
+                self._stream_refs[token_id] = refs
+                continue
+            self._stream_refs.pop(token_id, None)
+            self._stream_tokens.discard(token_id)
+            self._bids.pop(token_id, None)
+            self._asks.pop(token_id, None)
+            self._book_levels.pop(token_id, None)
+
+    async def _book_stream_loop(self):
+        """
+        Single WSS connection to the CLOB market channel for every token we
+        hold. Keeps self._bids fresh so exit checks read memory instead of
+        polling /book. Reconnects when the token set changes.
+        """
+        while True:
+            if not self._stream_tokens:
+                await asyncio.sleep(1)
+                continue
+            assets = list(self._stream_tokens)
+            self._stream_resub = False
+            try:
+                async with websockets.connect(CLOB_WS_URL, ping_interval=20) as ws:
+                    subscribed = set(assets)
+                    await ws.send(json.dumps({"type": "market", "assets_ids": assets}))
+                    log.info("CLOB book stream connected (%d tokens)", len(assets))
+                    async for raw in ws:
+                        self._handle_stream_msg(raw)
+                        if self._stream_resub:
+                            self._stream_resub = False
+                            # Subscribe additions on the live socket; the
+                            # handler filters messages for dropped tokens.
+                            added = self._stream_tokens - subscribed
+                            if added:
+                                await ws.send(json.dumps(
+                                    {"type": "market", "assets_ids": list(added)}))
+                                subscribed |= added
+                            # Only cycle the connection once enough stale
+                            # subscriptions pile up to matter for bandwidth.
+                            if len(subscribed - self._stream_tokens) > 32:
+                                break
+            except (websockets.ConnectionClosed, ConnectionError, OSError) as exc:
+                log.warning("CLOB WS disconnected (%s), reconnecting in 2s...", exc)
+                self._bids.clear()
+                self._asks.clear()
+                self._book_levels.clear()
+                await asyncio.sleep(2)
+            except Exception as exc:
+                log.error("CLOB WS unexpected error: %s", exc, exc_info=True)
+                self._bids.clear()
+                self._asks.clear()
+                self._book_levels.clear()
+                await asyncio.sleep(5)
+
+    def _refresh_best(self, token: str):
+        """Recompute best bid/ask for token from its maintained level maps.
+        The books here are a handful of levels deep, so a plain max/min over
+        a dict beats keeping a sorted structure around."""
+        bid_levels, ask_levels = self._book_levels[token]
+        if bid_levels:
+            self._bids[token] = max(bid_levels)
+        else:
+            self._bids.pop(token, None)
+        if ask_levels:
+            self._asks[token] = min(ask_levels)
+        else:
+            self._asks.pop(token, None)
+
+    def _handle_stream_msg(self, raw):
+        try:
+            data = _json_loads(raw)
+        except ValueError:
+            return
+        events = data if isinstance(data, list) else [data]
+        updated = False
+        for evt in events:
+            if not isinstance(evt, dict):
+                continue
+            token = evt.get("asset_id")
+            if not token or token not in self._stream_tokens:
+                continue
+            etype = evt.get("event_type")
+            if etype == "book":
+                bid_levels: Dict[float, float] = {}
+                for lvl in evt.get("bids", []):
+                    try:
+                        price = float(lvl.get("price", 0))
+                        size = float(lvl.get("size", 0))
+                    except (TypeError, ValueError):
+                        continue
+                    if price > 0 and size > 0:
+                        bid_levels[price] = size
+                ask_levels: Dict[float, float] = {}
+                for lvl in evt.get("asks", []):
+                    try:
+                        price = float(lvl.get("price", 0))
+                        size = float(lvl.get("size", 0))
+                    except (TypeError, ValueError):
+                        continue
+                    if price > 0 and size > 0:
+                        ask_levels[price] = size
+                self._book_levels[token] = (bid_levels, ask_levels)
+                self._refresh_best(token)
+                updated = True
+            elif etype == "price_change":
+                # Without a snapshot a partial delta can't define the best
+                # level; leave callers on REST until the book arrives.
+                levels = self._book_levels.get(token)
+                if levels is None:
+                    continue
+                bid_levels, ask_levels = levels
+                for change in evt.get("changes", []):
+                    side = change.get("side")
+                    if side == "BUY":
+                        level_map = bid_levels
+                    elif side == "SELL":
+                        level_map = ask_levels
+                    else:
+                        continue
+                    try:
+                        price = float(change.get("price", 0))
+                        size = float(change.get("size", 0))
+                    except (TypeError, ValueError):
+                        continue
+                    if size > 0:
+                        level_map[price] = size
+                    else:
+                        level_map.pop(price, None)
+                self._refresh_best(token)
+                updated = True
+        if updated:
+            # Stream data supersedes anything the REST TTL cache holds
+            for evt in events:
+                if isinstance(evt, dict):
+                    token = evt.get("asset_id")
+                    if token:
+                        self._bid_cache.pop(token, None)
+            self.bid_event.set()
+
     async def _get_best_bid(self, token_id: str) -> Optional[float]:
+        streamed = self._bids.get(token_id)
+        if streamed is not None:
+            return streamed
+        cached = self._bid_cache.get(token_id)
+        if cached is not None and time.monotonic() - cached[0] < BID_CACHE_TTL_SEC:
+            return cached[1]
+        # Coalesce concurrent callers: if a fetch for this token is already
+        # in flight, piggyback on its result instead of issuing another GET.
+        inflight = self._inflight.get(token_id)
+        if inflight is not None:
+            return await inflight
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[token_id] = future
+        result: Optional[float] = None
         try:
             url = f"{cfg.poly_clob_host}/book"
             params = {"token_id": token_id}
             async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                book = await resp.json()
+                book = _json_loads(await resp.read())
             bids = book.get("bids", [])
             if bids:
                 best = max(bids, key=lambda b: float(b.get("price", "0")))
-                return float(best["price"])
+                result = float(best["price"])
         except Exception as exc:
             log.warning("Bid fetch failed: %s", exc)
-        return None
+        finally:
+            self._inflight.pop(token_id, None)
+            self._bid_cache[token_id] = (time.monotonic(), result)
+            future.set_result(result)
+        return result
 
     # ------------------------------------------------------------------
     # Helpers
@@ -38,9 +38,25 @@ class DashboardServer:
         self._host = host
         self._port = port
         self._clients: Set[web.WebSocketResponse] = set()
-        self._start_time = time.time()
+        self._start_mono = time.monotonic()
         self._price_history = collections.deque(maxlen=MAX_PRICE_HISTORY)
         self._event_log = collections.deque(maxlen=MAX_LOG_ENTRIES)
+        self._event_seq = 0          # monotonic id for incremental event sync
+        self._broadcast_seq = 0      # highest seq already pushed to clients
+        # Config block is static for the life of the process except dry_run,
+        # which is refreshed per build below.
+        self._config_dict = {
+            "spike_move_usd": cfg.spike_move_usd,
+            "spike_window_sec": cfg.spike_window_sec,
+            "profit_target": cfg.profit_target_pct,
+            "moonbag": cfg.moonbag_pct,
+            "drawdown_trigger": cfg.drawdown_trigger_pct,
+            "protection_exit": cfg.protection_exit_pct,
+            "hard_stop": cfg.hard_stop_pct,
+            "max_position": cfg.max_position_usdc,
+            "daily_loss_limit": cfg.daily_loss_limit_usdc,
+            "dry_run": cfg.dry_run,
+        }
 
         self._app = web.Application()
         self._app.router.add_get("/ws", self._ws_handler)
@@ -54,18 +70,30 @@ class DashboardServer:
     # ── helpers ──
 
     def push_event(self, kind: str, msg: str):
-        self._event_log.append({"ts": time.time(), "kind": kind, "msg": msg})
+        self._event_seq += 1
+        self._event_log.append(
+            {"seq": self._event_seq, "ts": time.time(), "kind": kind, "msg": msg})
+
+    def _drain_strategy_events(self):
+        # Mode transitions land in the strategy's ring buffer instead of the
+        # synchronous logger; move them into the event log with their
+        # original timestamps so clients see them.
+        events = getattr(self._strat, "_events", None)
+        while events:
+            ts, kind, msg = events.popleft()
+            self._event_seq += 1
+            self._event_log.append(
+                {"seq": self._event_seq, "ts": ts, "kind": kind, "msg": msg})
 
     def _record_price(self):
-        if self._feed.current_price:
-            self._price_history.append({
-                "t": time.time(),
-                "p": self._feed.current_price,
-            })
+        price = self._feed.current_price
+        if price:
+            self._price_history.append({"t": time.time(), "p": price})
 
     # ── state builder ──
 
-    def _build_state(self) -> dict:
+    def _build_state(self, events_since: int = None) -> dict:
+        self._drain_strategy_events()
         feed = self._feed
         strat = self._strat
         s = strat.stats
@@ -74,12 +102,15 @@ class DashboardServer:
         # BTC price history for sparkline
         prices = list(self._price_history)
 
+        config = self._config_dict
+        config["dry_run"] = cfg.dry_run
+
         # Windows
         windows = []
-        for cid, ws in list(strat._windows.items()):
+        for ws in list(strat._windows.values()):
             w = {
-                "id": cid[:12],
-                "question": ws.market.question,
+                "id": ws.short_id,
+                "question": ws.market.question_short,
                 "open_price": ws.window_open_price,
                 "window_start": ws.market.window_start,
                 "window_end": ws.market.window_end,
@@ -112,7 +143,7 @@ class DashboardServer:
 
         # Positions with live P&L
         positions = []
-        for pos in strat._open_positions:
+        for pos in strat._open_positions.values():
             gain_pct = None
             current_val = None
             if pos.avg_entry > 0:
@@ -126,12 +157,12 @@ class DashboardServer:
                 "protection_mode": pos.protection_mode,
                 "moonbag_mode": pos.moonbag_mode,
                 "peak_gain": round(pos.peak_gain, 2),
-                "market": pos.market.question,
+                "market": pos.market.question_short,
             })
 
         # Closed trades with extra detail
         closed = []
-        for pos in strat._closed_positions[-30:]:
+        for pos in list(strat._closed_positions)[-30:]:
             entry_cost = pos.avg_entry * pos.qty
             closed.append({
                 "side": pos.side,
@@ -141,7 +172,7 @@ class DashboardServer:
                 "spent": round(entry_cost, 2),
                 "pnl": round(pos.pnl, 2) if pos.pnl is not None else None,
                 "pnl_pct": round(((pos.exit_price - pos.avg_entry) / pos.avg_entry) * 100, 1) if pos.exit_price and pos.avg_entry else None,
-                "market": pos.market.question,
+                "market": pos.market.question_short,
             })
 
         # Computed aggregates
@@ -150,24 +181,13 @@ class DashboardServer:
         total_trades = s.wins + s.losses
         win_rate = round((s.wins / total_trades) * 100, 1) if total_trades > 0 else 0
 
-        return {
+        state = {
             "ts": now,
-            "uptime": round(now - self._start_time),
+            "uptime": round(time.monotonic() - self._start_mono),
             "btc_price": feed.current_price,
             "btc_live": feed.is_live,
             "price_history": prices,
-            "config": {
-                "spike_move_usd": cfg.spike_move_usd,
-                "spike_window_sec": cfg.spike_window_sec,
-                "profit_target": cfg.profit_target_pct,
-                "moonbag": cfg.moonbag_pct,
-                "drawdown_trigger": cfg.drawdown_trigger_pct,
-                "protection_exit": cfg.protection_exit_pct,
-                "hard_stop": cfg.hard_stop_pct,
-                "max_position": cfg.max_position_usdc,
-                "daily_loss_limit": cfg.daily_loss_limit_usdc,
-                "dry_run": cfg.dry_run,
-            },
+            "config": config,
             "stats": {
                 "signals": s.total_signals,
                 "trades": s.total_trades,
@@ -181,17 +201,23 @@ class DashboardServer:
                 "avg_loss": round(sum(loss_pnl) / len(loss_pnl), 2) if loss_pnl else 0,
                 "best_trade": round(max(wins_pnl), 2) if wins_pnl else 0,
                 "worst_trade": round(min(loss_pnl), 2) if loss_pnl else 0,
-                "hourly_pnl": dict(s.hourly_pnl) if hasattr(s, 'hourly_pnl') else {},
+                "hourly_pnl": s.hourly_pnl,
             },
             "windows": windows,
             "positions": positions,
             "closed": closed,
-            "events": list(self._event_log),
+            "event_seq_head": self._event_seq,
             "calendar": daily_calendar_data(7),
             "s2": self._build_s2_state(),
             "s3": self._build_s3_state(),
             "s4": self._build_s4_state(),
         }
+        if events_since is None:
+            # Snapshot (REST / fresh WS connect): full event log
+            state["events"] = list(self._event_log)
+        else:
+            state["new_events"] = [e for e in self._event_log if e["seq"] > events_since]
+        return state
 
     def _build_s2_state(self) -> dict:
         """Build strategy 2 state."""
@@ -210,12 +236,12 @@ class DashboardServer:
                 "spent": p.spent,
                 "sell_target": p.sell_target,
                 "age": round(time.time() - p.entry_time),
-                "market": p.market.question,
+                "market": p.market.question_short,
                 "status": p.status,
             })
 
         closed = []
-        for p in s2.closed_positions[-20:]:
+        for p in list(s2.closed_positions)[-20:]:
             closed.append({
                 "side": p.side,
                 "entry": p.entry_price,
@@ -224,7 +250,7 @@ class DashboardServer:
                 "spent": p.spent,
                 "pnl": round(p.pnl, 2) if p.pnl is not None else None,
                 "pnl_pct": round(((p.exit_price - p.entry_price) / p.entry_price) * 100, 1) if p.exit_price and p.entry_price else None,
-                "market": p.market.question,
+                "market": p.market.question_short,
                 "status": p.status,
             })
 
@@ -239,7 +265,7 @@ class DashboardServer:
                 "pnl": round(st.total_pnl, 2),
                 "win_rate": round((st.wins / total) * 100, 1) if total > 0 else 0,
                 "last_action": st.last_action,
-                "hourly_pnl": dict(st.hourly_pnl) if hasattr(st, 'hourly_pnl') else {},
+                "hourly_pnl": st.hourly_pnl,
                 "last_hour_report": st.last_hour_report if hasattr(st, 'last_hour_report') else "",
             },
             "positions": positions,
@@ -260,17 +286,17 @@ class DashboardServer:
             positions.append({
                 "side": p.side, "entry": p.entry_price, "qty": p.qty,
                 "spent": p.spent, "age": round(time.time() - p.entry_time),
-                "market": p.market.question, "status": p.status,
+                "market": p.market.question_short, "status": p.status,
             })
 
         closed = []
-        for p in s3.closed_positions[-20:]:
+        for p in list(s3.closed_positions)[-20:]:
             closed.append({
                 "side": p.side, "entry": p.entry_price, "exit": p.exit_price,
                 "qty": p.qty, "spent": p.spent,
                 "pnl": round(p.pnl, 2) if p.pnl is not None else None,
                 "pnl_pct": round(((p.exit_price - p.entry_price) / p.entry_price) * 100, 1) if p.exit_price and p.entry_price else None,
-                "market": p.market.question, "status": p.status,
+                "market": p.market.question_short, "status": p.status,
             })
 
         total = st.wins + st.losses
@@ -285,7 +311,8 @@ class DashboardServer:
                 "pnl": round(st.total_pnl, 2),
                 "win_rate": round((st.wins / total) * 100, 1) if total > 0 else 0,
                 "last_action": st.last_action,
-                "hourly_pnl": dict(st.hourly_pnl),
+                # S3 keeps 24 hour-of-day buckets; rebuild the keyed view here
+                "hourly_pnl": {"%02d:00" % h: v for h, v in enumerate(st.hourly_pnl) if v},
             },
             "positions": positions,
             "closed": closed,
@@ -303,10 +330,10 @@ class DashboardServer:
                 "side": "Yes+No", "entry": round(entry_sum, 3), "qty": p.qty,
                 "yes_entry": round(p.yes_entry, 3), "no_entry": round(p.no_entry, 3),
                 "spent": round(p.spent_yes + p.spent_no, 2), "age": round(time.time() - p.entry_time),
-                "market": p.market.question, "status": p.status,
+                "market": p.market.question_short, "status": p.status,
             })
         closed = []
-        for p in s4.closed_positions[-20:]:
+        for p in list(s4.closed_positions)[-20:]:
             entry_sum = p.yes_entry + p.no_entry
             pnl_pct = round((1.0 - entry_sum) / entry_sum * 100, 1) if entry_sum else None
             closed.append({
@@ -316,7 +343,7 @@ class DashboardServer:
                 "winning_side": p.winning_side, "losing_side": p.losing_side,
                 "pnl": round(p.pnl, 2) if p.pnl is not None else None,
                 "pnl_pct": pnl_pct,
-                "market": p.market.question, "status": p.status,
+                "market": p.market.question_short, "status": p.status,
             })
         total = st.wins + st.losses
         return {
@@ -329,7 +356,8 @@ class DashboardServer:
                 "pnl": round(st.total_pnl, 2),
                 "win_rate": round((st.wins / total) * 100, 1) if total > 0 else 0,
                 "last_action": st.last_action,
-                "hourly_pnl": dict(st.hourly_pnl),
+                # S4 keeps 24 hour-of-day buckets; rebuild the keyed view here
+                "hourly_pnl": {"%02d:00" % h: v for h, v in enumerate(st.hourly_pnl) if v},
             },
             "positions": positions,
             "closed": closed,
@@ -349,11 +377,18 @@ class DashboardServer:
         )
 
     async def _ws_handler(self, request):
-        ws = web.WebSocketResponse()
+        # permessage-deflate: state payloads are repetitive JSON and compress well
+        ws = web.WebSocketResponse(compress=15)
         await ws.prepare(request)
         self._clients.add(ws)
         log.info("Dashboard client connected (%d total)", len(self._clients))
         self.push_event("connect", "Dashboard client connected")
+        try:
+            # Full snapshot (including the whole event log) on connect;
+            # periodic broadcasts then carry only new_events.
+            await ws.send_str(json.dumps(self._build_state()))
+        except Exception:
+            pass
         try:
             async for msg in ws:
                 pass
@@ -367,15 +402,20 @@ class DashboardServer:
     async def _broadcast_loop(self):
         while True:
             self._record_price()
-            if self._clients:
-                state = json.dumps(self._build_state())
-                dead = set()
-                for ws in self._clients:
-                    try:
-                        await ws.send_str(state)
-                    except Exception:
-                        dead.add(ws)
-                self._clients -= dead
+            if not self._clients:
+                # Nobody watching: keep feeding the sparkline, skip the
+                # full state build entirely.
+                await asyncio.sleep(1)
+                continue
+            state = json.dumps(self._build_state(events_since=self._broadcast_seq))
+            self._broadcast_seq = self._event_seq
+            dead = set()
+            for ws in self._clients:
+                try:
+                    await ws.send_str(state)
+                except Exception:
+                    dead.add(ws)
+            self._clients -= dead
             await asyncio.sleep(1)
 
     async def run(self):
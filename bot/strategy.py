@@ -23,13 +23,15 @@ We:
 """
 
 import asyncio
+import collections
+import heapq
 import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from bot.time_util import date_key_est, hour_key_est
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Deque
 
 from bot.config import cfg
 from bot.binance_feed import BinanceFeed
@@ -38,17 +40,56 @@ from bot.polymarket import PolymarketClient, Market, Position
 log = logging.getLogger("strategy")
 
 
-@dataclass
+def _exit_decision(gain_pct: float, bid: float, entry: float, qty: float,
+                   peak_gain: float, moonbag_mode: bool,
+                   hard_stop_pct: float, profit_target_pct: float,
+                   max_loss_usdc: float) -> Optional[str]:
+    """
+    Pure exit-decision kernel: scalar in, sell reason out (None = hold).
+
+    Kept free of self/dataclass access so it can be profiled in isolation
+    or swapped for a compiled version without touching the loop around it.
+    """
+    # Dollar loss cap: exit once this trade's loss in $ hits limit
+    if bid < entry and max_loss_usdc > 0:
+        dollar_loss = (entry - bid) * qty
+        if dollar_loss >= max_loss_usdc:
+            return f"MAX $ LOSS ${dollar_loss:.2f}"
+    # Hard stop: if loss hits -50%, sell immediately (never get liquidated)
+    if gain_pct <= hard_stop_pct:
+        return f"HARD STOP {gain_pct:.1f}%"
+    # Hard cap: if gain hits 20%, sell no matter what
+    if gain_pct >= 20.0:
+        return f"HARD CAP +{gain_pct:.1f}%"
+    if moonbag_mode:
+        # Dynamic trailing stop: floor = half the peak gain
+        trailing_floor = peak_gain / 2.0
+        if gain_pct <= trailing_floor:
+            return (
+                f"MOONBAG TRAIL +{gain_pct:.1f}% "
+                f"(peak +{peak_gain:.1f}%, floor +{trailing_floor:.1f}%)"
+            )
+        return None
+    if gain_pct >= profit_target_pct:
+        # Normal: sell at +5%
+        return f"PROFIT +{gain_pct:.1f}%"
+    return None
+
+
+@dataclass(slots=True)
 class WindowState:
     """Tracks per-window state."""
     market: Market
+    short_id: str = ""                         # condition_id[:12], for dashboard
+    ready_time: float = 0.0                    # window_start + settle delay
+    end_ts: float = 0.0                        # window_end (required at discovery)
     window_open_price: Optional[float] = None  # BTC price at window start
     signal_fired: bool = False                   # did we already trade this window?
     signal_side: str = ""                        # YES or NO
     position: Optional[Position] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyStats:
     """Running statistics for the dashboard."""
     total_signals: int = 0
@@ -77,14 +118,24 @@ class Strategy:
 
         # Active window states keyed by condition_id
         self._windows: Dict[str, WindowState] = {}
-        # Positions awaiting exit
-        self._open_positions: List[Position] = []
-        # Closed positions for logging
-        self._closed_positions: List[Position] = []
+        # (end_ts, condition_id) heap so expiry is O(log N), not a full scan
+        self._expiry_heap: List[tuple] = []
+        # Windows still awaiting a signal; armed windows drop out so the
+        # per-tick detection loop skips them entirely
+        self._windows_pending: set = set()
+        # Positions awaiting exit, keyed by token_id for O(1) close
+        self._open_positions: Dict[str, Position] = {}
+        # Closed positions for logging (bounded so memory stays flat on long runs)
+        self._closed_positions: Deque[Position] = collections.deque(maxlen=50)
+        # Mode transitions land here instead of the synchronous logger;
+        # (ts, kind, detail) tuples, drained by whoever wants them
+        self._events: Deque[tuple] = collections.deque(maxlen=1000)
 
         self._running = False
         self._consecutive_losses = 0
         self._pause_until = 0.0  # no new buys until this timestamp (after loss streak)
+        self._last_discovery = 0.0
+        self._last_day = ""  # EST date key; triggers daily reset on rollover
 
     # ------------------------------------------------------------------
     # Main loop
@@ -100,7 +151,25 @@ class Strategy:
                 await self._tick()
             except Exception as exc:
                 log.error("Strategy tick error: %s", exc, exc_info=True)
-            await asyncio.sleep(cfg.poll_interval_sec)
+            await self._wait_for_activity(cfg.poll_interval_sec)
+
+    async def _wait_for_activity(self, timeout: float):
+        """
+        Sleep until a Binance trade tick or a streamed Polymarket bid
+        arrives, or `timeout` elapses. Keeps reaction latency at one event
+        dispatch instead of the poll interval, while the timeout still
+        drives discovery and window expiry when both feeds are quiet.
+        """
+        self.feed.price_event.clear()
+        self.poly.bid_event.clear()
+        waiters = [
+            asyncio.ensure_future(self.feed.price_event.wait()),
+            asyncio.ensure_future(self.poly.bid_event.wait()),
+        ]
+        _, pending = await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
 
     def stop(self):
         self._running = False
@@ -116,75 +185,93 @@ class Strategy:
         btc_price = self.feed.current_price
         self._check_daily_reset()
 
+        # Bind per-tick config reads to locals (re-read each tick so env
+        # changes via cfg still take effect)
+        spike_move_usd = cfg.spike_move_usd
+        spike_window_sec = cfg.spike_window_sec
+        s1_min_buy_cents = cfg.s1_min_buy_cents
+
         # ---- 1. Refresh active markets every ~30 s ----
         now = time.time()
-        if not hasattr(self, "_last_discovery") or now - self._last_discovery > 30:
+        if now - self._last_discovery > 30:
             await self._discover_markets()
             self._last_discovery = now
 
-        # ---- 2. For each active window, check for spike signal ----
-        for cid, ws in list(self._windows.items()):
-            # Skip if window has ended
-            if ws.market.window_end and now > ws.market.window_end:
-                self._windows.pop(cid, None)
+        # ---- 2. Drop ended windows (heap ordered by end time) ----
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, cid = heapq.heappop(heap)
+            self._windows.pop(cid, None)
+            self._windows_pending.discard(cid)
+
+        # ---- 3. Check unarmed windows for a spike signal ----
+        # Deferred removal: iterate the live set, collect armed/stale cids
+        # and drop them afterwards, avoiding a set copy per tick.
+        armed: List[str] = []
+        for cid in self._windows_pending:
+            ws = self._windows.get(cid)
+            if ws is None:
+                armed.append(cid)
                 continue
-
             # Record the BTC price 10s after the window opens (let market settle)
             if ws.window_open_price is None:
-                ready_time = (ws.market.window_start or 0) + 10
-                if now >= ready_time:
+                if now >= ws.ready_time:
                     ws.window_open_price = btc_price
                     log.info("Window baseline set (10s delay): $%.2f for %s",
-                             btc_price, ws.market.question[:50])
+                             btc_price, ws.market.question_short)
 
             if ws.window_open_price is None or ws.signal_fired:
                 continue
 
-            self.stats.current_window = ws.market.question[:60]
+            self.stats.current_window = ws.market.question_short
 
             # Don't buy in the last 20 seconds of the window
-            time_left = (ws.market.window_end - now) if ws.market.window_end else 999
-            if time_left <= 20:
+            if ws.end_ts - now <= 20:
                 continue
 
             # ── Instant momentum detection (no delay) ──
             # Checks $15 move in 2s with consistent direction (midpoint check)
-            spike_delta = self.feed.detect_momentum(cfg.spike_move_usd, cfg.spike_window_sec)
+            spike_delta = self.feed.detect_momentum(spike_move_usd, spike_window_sec)
             if spike_delta is not None:
                 side = "YES" if spike_delta > 0 else "NO"
                 ws.signal_fired = True
+                armed.append(cid)
                 ws.signal_side = side
                 self.stats.total_signals += 1
                 self.stats.current_signal = f"{'UP' if side == 'YES' else 'DOWN'} ${spike_delta:+.0f}"
                 log.info(
                     "MOMENTUM: $%+.0f in %.1fs → BUY %s | %s",
-                    spike_delta, cfg.spike_window_sec,
-                    side, ws.market.question[:50],
+                    spike_delta, spike_window_sec,
+                    side, ws.market.question_short,
                 )
 
                 # Execute the buy IMMEDIATELY (only if ask >= 20c)
                 await self.poly.get_market_prices(ws.market)
                 ask = ws.market.yes_ask if side == "YES" else ws.market.no_ask
-                if ask < cfg.s1_min_buy_cents:
-                    log.info("S1: Skipping buy — %s ask %.2fc < min %.2fc", side, ask * 100, cfg.s1_min_buy_cents * 100)
+                if ask < s1_min_buy_cents:
+                    log.info("S1: Skipping buy — %s ask %.2fc < min %.2fc", side, ask * 100, s1_min_buy_cents * 100)
                     ws.signal_fired = True  # still mark so we don't retry this window
                     continue
                 if cfg.daily_loss_limit_usdc < 0 and self.stats.daily_pnl <= cfg.daily_loss_limit_usdc:
                     log.info("S1: Skipping buy — daily P&L $%.2f at or below limit $%.2f", self.stats.daily_pnl, cfg.daily_loss_limit_usdc)
                     ws.signal_fired = True
                     continue
-                if time.time() < getattr(self, '_pause_until', 0):
+                if now < self._pause_until:
                     log.info("S1: Skipping buy — cooldown after %d consecutive losses (%.0f min)", self._consecutive_losses, cfg.pause_minutes_after_streak)
                     ws.signal_fired = True
                     continue
                 position = await self.poly.buy(ws.market, side, cfg.max_position_usdc)
                 if position.filled:
                     ws.position = position
-                    self._open_positions.append(position)
+                    self._open_positions[position.token_id] = position
+                    self.poly.subscribe_bids([position.token_id])
                     self.stats.total_trades += 1
                     self.stats.last_action = f"BUY {side} @ ${position.avg_entry:.4f}"
 
-        # ---- 3. Monitor open positions for exit ----
+        for cid in armed:
+            self._windows_pending.discard(cid)
+
+        # ---- 4. Monitor open positions for exit ----
         await self._check_exits()
 
     # ------------------------------------------------------------------
@@ -195,79 +282,97 @@ class Strategy:
         markets = await self.poly.find_active_btc_5min_markets()
         for mkt in markets:
             if mkt.condition_id not in self._windows:
-                self._windows[mkt.condition_id] = WindowState(market=mkt)
-                log.info("Tracking new market: %s", mkt.question[:70])
+                if not mkt.window_end:
+                    # Without an end time we can't run the window lifecycle
+                    log.warning("Skipping market without end time: %s", mkt.question_short)
+                    continue
+                self._windows[mkt.condition_id] = WindowState(
+                    market=mkt,
+                    short_id=mkt.condition_id[:12],
+                    ready_time=(mkt.window_start or 0) + 10,
+                    end_ts=mkt.window_end,
+                )
+                self._windows_pending.add(mkt.condition_id)
+                heapq.heappush(self._expiry_heap, (mkt.window_end, mkt.condition_id))
+                log.info("Tracking new market: %s", mkt.question_short)
 
     # ------------------------------------------------------------------
     # Exit management
     # ------------------------------------------------------------------
 
     async def _check_exits(self):
-        still_open: List[Position] = []
-        for pos in self._open_positions:
-            if pos.exit_price is not None:
-                continue  # already closed
-
-            # Get current bid price for our token
-            bid = await self.poly._get_best_bid(pos.token_id)
+        pending = [p for p in self._open_positions.values() if p.exit_price is None]
+        if not pending:
+            return
+
+        # Streamed bids first (no I/O); one batched CLOB request for the rest
+        bid_map = {}
+        missing = []
+        for p in pending:
+            bid = self.poly.streamed_bid(p.token_id)
+            if bid is None:
+                missing.append(p.token_id)
+            else:
+                bid_map[p.token_id] = bid
+        if missing:
+            bid_map.update(await self.poly.get_best_bids_batch(missing))
+
+        # Hoist config lookups out of the per-position loop
+        moonbag_pct = cfg.moonbag_pct
+        hard_stop_pct = cfg.hard_stop_pct
+        profit_target_pct = cfg.profit_target_pct
+        max_loss_per_trade_usdc = cfg.max_loss_per_trade_usdc
+        losses_to_pause = cfg.consecutive_losses_to_pause
+        pause_minutes = cfg.pause_minutes_after_streak
+
+        # Upper edge of the hold band: below this, nothing can trigger
+        # (profit target, hard cap at +20 and the moonbag transition all
+        # sit at or above it)
+        hold_band_top = min(profit_target_pct, moonbag_pct, 20.0)
 
+        now = time.time()
+        for pos in pending:
+            bid = bid_map.get(pos.token_id)
             if bid is None:
-                still_open.append(pos)
-                continue
+                continue  # no quote this sweep; stays open
 
             gain_pct = ((bid - pos.avg_entry) / pos.avg_entry) * 100
-            now = time.time()
             window_ended = pos.market.window_end and now > pos.market.window_end
 
             # Track peak gain
             if gain_pct > pos.peak_gain:
                 pos.peak_gain = gain_pct
 
+            # Fast path: plain WAIT. No mode active, window still running,
+            # gain inside (hard stop, hold band top) and the dollar loss cap
+            # not hit — the 95% case exits here with one compound predicate.
+            if (hard_stop_pct < gain_pct < hold_band_top
+                    and not pos.moonbag_mode
+                    and not pos.protection_mode
+                    and not window_ended
+                    and not (max_loss_per_trade_usdc > 0
+                             and bid < pos.avg_entry
+                             and (pos.avg_entry - bid) * pos.qty >= max_loss_per_trade_usdc)):
+                continue
+
             # --- Mode transitions ---
 
             # Moonbag: gain hits 20%+ → let it ride with dynamic trailing stop
-            if not pos.moonbag_mode and gain_pct >= cfg.moonbag_pct:
+            if not pos.moonbag_mode and gain_pct >= moonbag_pct:
                 pos.moonbag_mode = True
-                log.info(
-                    "MOONBAG MODE: %s hit +%.1f%%! Letting it ride, "
-                    "trailing stop at half peak",
-                    pos.side, gain_pct,
-                )
+                self._events.append((now, "MOONBAG", f"{pos.side} +{gain_pct:.1f}%"))
+                log.debug("MOONBAG MODE: %s hit +%.1f%%, trailing stop at half peak",
+                          pos.side, gain_pct)
                 self.stats.last_action = f"MOONBAG {pos.side} +{gain_pct:.1f}%"
 
-            # --- Exit decisions ---
-            should_sell = False
-            sell_reason = ""
-
-            # Dollar loss cap: exit once this trade's loss in $ hits limit (stops one position blowing up)
-            if bid < pos.avg_entry and cfg.max_loss_per_trade_usdc > 0:
-                dollar_loss = (pos.avg_entry - bid) * pos.qty
-                if dollar_loss >= cfg.max_loss_per_trade_usdc:
-                    should_sell = True
-                    sell_reason = f"MAX $ LOSS ${dollar_loss:.2f}"
-            # Hard stop: if loss hits -50%, sell immediately (never get liquidated)
-            if not should_sell and gain_pct <= cfg.hard_stop_pct:
-                should_sell = True
-                sell_reason = f"HARD STOP {gain_pct:.1f}%"
-            # Hard cap: if gain hits 20%, sell no matter what
-            elif gain_pct >= 20.0:
-                should_sell = True
-                sell_reason = f"HARD CAP +{gain_pct:.1f}%"
-            elif pos.moonbag_mode:
-                # Dynamic trailing stop: floor = half the peak gain
-                trailing_floor = pos.peak_gain / 2.0
-                if gain_pct <= trailing_floor:
-                    should_sell = True
-                    sell_reason = (
-                        f"MOONBAG TRAIL +{gain_pct:.1f}% "
-                        f"(peak +{pos.peak_gain:.1f}%, floor +{trailing_floor:.1f}%)"
-                    )
-            elif gain_pct >= cfg.profit_target_pct:
-                # Normal: sell at +5%
-                should_sell = True
-                sell_reason = f"PROFIT +{gain_pct:.1f}%"
-
-            if should_sell:
+            # --- Exit decisions (pure kernel, see _exit_decision) ---
+            sell_reason = _exit_decision(
+                gain_pct, bid, pos.avg_entry, pos.qty, pos.peak_gain,
+                pos.moonbag_mode, hard_stop_pct, profit_target_pct,
+                max_loss_per_trade_usdc,
+            )
+
+            if sell_reason:
                 log.info(
                     "EXIT [%s]: %s | entry=%.4f bid=%.4f gain=%.1f%%",
                     sell_reason, pos.side, pos.avg_entry, bid, gain_pct,
@@ -284,14 +389,14 @@ class Strategy:
                         self._consecutive_losses = 0
                     else:
                         self.stats.losses += 1
-                        self._consecutive_losses = getattr(self, '_consecutive_losses', 0) + 1
-                        if self._consecutive_losses >= cfg.consecutive_losses_to_pause:
-                            self._pause_until = time.time() + cfg.pause_minutes_after_streak * 60
-                            log.info("S1: %d consecutive losses → pause new buys for %.0f min", self._consecutive_losses, cfg.pause_minutes_after_streak)
+                        self._consecutive_losses += 1
+                        if self._consecutive_losses >= losses_to_pause:
+                            self._pause_until = now + pause_minutes * 60
+                            log.info("S1: %d consecutive losses → pause new buys for %.0f min", self._consecutive_losses, pause_minutes)
                     self.stats.last_action = f"SELL {pos.side} [{sell_reason}]"
                     self._closed_positions.append(pos)
-                else:
-                    still_open.append(pos)
+                    del self._open_positions[pos.token_id]
+                    self.poly.unsubscribe_bids([pos.token_id])
             elif window_ended:
                 # Window over -- settles on-chain
                 log.info(
@@ -309,16 +414,14 @@ class Strategy:
                     self._consecutive_losses = 0
                 else:
                     self.stats.losses += 1
-                    self._consecutive_losses = getattr(self, '_consecutive_losses', 0) + 1
-                    if self._consecutive_losses >= cfg.consecutive_losses_to_pause:
-                        self._pause_until = time.time() + cfg.pause_minutes_after_streak * 60
-                        log.info("S1: %d consecutive losses → pause new buys for %.0f min", self._consecutive_losses, cfg.pause_minutes_after_streak)
+                    self._consecutive_losses += 1
+                    if self._consecutive_losses >= losses_to_pause:
+                        self._pause_until = now + pause_minutes * 60
+                        log.info("S1: %d consecutive losses → pause new buys for %.0f min", self._consecutive_losses, pause_minutes)
                 self.stats.last_action = f"SETTLED {pos.side} PnL=${pos.pnl:.2f}"
                 self._closed_positions.append(pos)
-            else:
-                still_open.append(pos)
-
-        self._open_positions = still_open
+                del self._open_positions[pos.token_id]
+                self.poly.unsubscribe_bids([pos.token_id])
 
     def _record_hourly_pnl(self, pnl: float):
         hour_key = hour_key_est()
@@ -326,8 +429,8 @@ class Strategy:
 
     def _check_daily_reset(self):
         today = date_key_est()
-        if not hasattr(self, "_last_day") or self._last_day != today:
-            if hasattr(self, "_last_day") and self._last_day:
+        if self._last_day != today:
+            if self._last_day:
                 log.info("═══ S1 NEW DAY — resetting hourly P&L and daily P&L ═══")
             self.stats.hourly_pnl = {}
             self.stats.daily_pnl = 0.0
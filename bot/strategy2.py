@@ -11,6 +11,8 @@ giving you profit. If one side hits $0.60 you make ~$0.10 per share.
 """
 
 import asyncio
+import collections
+import heapq
 import logging
 import math
 import time
@@ -18,7 +20,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from bot.time_util import date_key_est, hour_key_est
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Dict, Deque
 
 from bot.polymarket import PolymarketClient, Market
 from bot.config import cfg
@@ -31,8 +33,23 @@ SELL_TARGET = 0.55
 MAX_MARKETS = 5          # buy into the next 5 upcoming markets
 USDC_PER_SIDE = 25.0     # $25 per side = $50 total per market
 
+# Asks tick on a 0.001 grid inside the buy band, so share quantities are a
+# tiny fixed table. Using canonical grid floats also keeps entry_price and
+# the later PnL math free of stray FP representations.
+QTY_TABLE = {
+    round(BUY_MIN + i * 0.001, 3): math.floor((USDC_PER_SIDE / round(BUY_MIN + i * 0.001, 3)) * 100) / 100
+    for i in range(int(round((BUY_MAX - BUY_MIN) / 0.001)) + 1)
+}
 
-@dataclass
+
+def _qty_for(ask: float) -> float:
+    qty = QTY_TABLE.get(round(ask, 3))
+    if qty is None:  # off-grid ask (shouldn't happen inside the band)
+        qty = math.floor((USDC_PER_SIDE / ask) * 100) / 100
+    return qty
+
+
+@dataclass(slots=True)
 class S2Stats:
     """Running stats for strategy 2."""
     markets_bought: int = 0
@@ -53,7 +70,7 @@ class S2Stats:
             self.hourly_pnl = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class S2Position:
     """A position in strategy 2 (one side of a market)."""
     market: Market
@@ -76,11 +93,20 @@ class Strategy2:
     def __init__(self, poly: PolymarketClient):
         self.poly = poly
         self.stats = S2Stats()
-        self._positions: List[S2Position] = []
-        self._closed: List[S2Position] = []
-        self._bought_cids: Set[str] = set()
+        # Open positions keyed by token_id; closed ones move to _closed
+        self._open: Dict[str, S2Position] = {}
+        self._closed: Deque[S2Position] = collections.deque(maxlen=50)
+        # cid -> forget-after timestamp; pruned as entries age out so the
+        # map stays flat over days of operation
+        self._bought_cids: Dict[str, float] = {}
+        # Open-position count per market; len() == markets still open
+        self._open_per_cid: collections.Counter = collections.Counter()
+        self._expiry_heap: List[tuple] = []  # (window_end, condition_id)
         self._running = False
+        self._stop_event = asyncio.Event()
         self._last_hour_key = ""
+        self._hour_bucket = -1  # int(time)//3600; cheap change detector
+        self._next_disc_at = 0.0  # adaptive: aim ~10 s before next window opens
 
     async def run(self):
         self._running = True
@@ -94,21 +120,35 @@ class Strategy2:
                 await self._tick()
             except Exception as exc:
                 log.error("Strategy 2 tick error: %s", exc, exc_info=True)
-            await asyncio.sleep(2)
+            if not self._running:
+                break
+            # Wake as soon as a streamed bid for one of our tokens moves or
+            # stop() is called; the 2 s timeout still drives discovery and
+            # window resolution.
+            self.poly.bid_event.clear()
+            waits = [
+                asyncio.ensure_future(self.poly.bid_event.wait()),
+                asyncio.ensure_future(self._stop_event.wait()),
+            ]
+            done, pending = await asyncio.wait(
+                waits, timeout=2, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
 
     def stop(self):
         self._running = False
+        self._stop_event.set()
 
     async def _tick(self):
         now = time.time()
 
         # ── 1. Discover upcoming markets and buy both sides ──
-        if not hasattr(self, "_last_disc") or now - self._last_disc > 60:
-            await self._buy_upcoming()
-            self._last_disc = now
+        if now >= self._next_disc_at:
+            await self._buy_upcoming(now)
 
         # ── 2. Check open positions for sell fills / resolution ──
-        await self._check_positions()
+        await self._check_positions(now)
 
         # ── 3. Hourly P&L report ──
         self._hourly_report()
@@ -117,9 +157,9 @@ class Strategy2:
     # Buy both sides of upcoming markets
     # ------------------------------------------------------------------
 
-    async def _buy_upcoming(self):
+    async def _buy_upcoming(self, now: float):
+        self._gc_bought_cids(now)
         markets = await self.poly.find_active_btc_5min_markets()
-        now = time.time()
 
         # Only markets that haven't started yet
         upcoming = [m for m in markets
@@ -128,16 +168,18 @@ class Strategy2:
         upcoming.sort(key=lambda m: m.window_start)
 
         # How many more markets can we buy into
-        open_market_count = len(self._bought_cids) - len([
-            cid for cid in self._bought_cids
-            if all(p.status != "open" for p in self._positions if p.market.condition_id == cid)
-        ])
-        slots = MAX_MARKETS - max(0, open_market_count)
+        slots = MAX_MARKETS - len(self._open_per_cid)
 
         for mkt in upcoming[:max(0, slots)]:
-            await self._try_buy_both(mkt)
+            await self._try_buy_both(mkt, now)
 
-    async def _try_buy_both(self, market: Market):
+        # Poll again ~10 s before the next window opens (fresh asks right
+        # when they matter) but never more often than every 5 s; fall back
+        # to the old 60 s cadence when nothing is on the calendar.
+        next_start = min((m.window_start for m in upcoming), default=now + 70)
+        self._next_disc_at = max(now + 5, next_start - 10)
+
+    async def _try_buy_both(self, market: Market, now: float):
         """Buy BOTH Up and Down sides of a market at 50-51c each."""
         if cfg.daily_loss_limit_usdc < 0 and self.stats.daily_pnl <= cfg.daily_loss_limit_usdc:
             log.info("S2: Skipping buy — daily P&L $%.2f at or below limit $%.2f", self.stats.daily_pnl, cfg.daily_loss_limit_usdc)
@@ -148,57 +190,91 @@ class Strategy2:
 
         # Both must be in the 50-51c range
         if not (BUY_MIN <= up_ask <= BUY_MAX):
-            log.info("S2: %s Up ask=$%.3f outside $%.2f-$%.2f, skipping",
-                     market.question[:35], up_ask, BUY_MIN, BUY_MAX)
+            if log.isEnabledFor(logging.INFO):
+                log.info("S2: %s Up ask=$%.3f outside $%.2f-$%.2f, skipping",
+                         market.question_short, up_ask, BUY_MIN, BUY_MAX)
             return
         if not (BUY_MIN <= down_ask <= BUY_MAX):
-            log.info("S2: %s Down ask=$%.3f outside $%.2f-$%.2f, skipping",
-                     market.question[:35], down_ask, BUY_MIN, BUY_MAX)
+            if log.isEnabledFor(logging.INFO):
+                log.info("S2: %s Down ask=$%.3f outside $%.2f-$%.2f, skipping",
+                         market.question_short, down_ask, BUY_MIN, BUY_MAX)
             return
 
-        self._bought_cids.add(market.condition_id)
+        # Snap to the 0.001 grid once so entry_price shares the table's
+        # canonical floats and the later PnL math sees no stray
+        # representations.
+        up_ask = round(up_ask, 3)
+        down_ask = round(down_ask, 3)
+
+        # Keep the cid well past resolution so re-listed payloads can't
+        # trigger a re-buy of the same window.
+        self._bought_cids[market.condition_id] = (market.window_end or now) + 3600
+        self._open_per_cid[market.condition_id] += 2
+        if market.window_end:
+            heapq.heappush(self._expiry_heap, (market.window_end, market.condition_id))
         self.stats.markets_bought += 1
 
         # Buy Up side
-        up_qty = math.floor((USDC_PER_SIDE / up_ask) * 100) / 100
+        up_qty = _qty_for(up_ask)
         up_pos = S2Position(
             market=market, side="Up", token_id=market.yes_token_id,
             entry_price=up_ask, qty=up_qty, spent=USDC_PER_SIDE,
-            sell_target=SELL_TARGET, entry_time=time.time(), filled=True,
+            sell_target=SELL_TARGET, entry_time=now, filled=True,
         )
-        self._positions.append(up_pos)
+        self._open[market.yes_token_id] = up_pos
         self.stats.total_positions += 1
 
         # Buy Down side
-        dn_qty = math.floor((USDC_PER_SIDE / down_ask) * 100) / 100
+        dn_qty = _qty_for(down_ask)
         dn_pos = S2Position(
             market=market, side="Down", token_id=market.no_token_id,
             entry_price=down_ask, qty=dn_qty, spent=USDC_PER_SIDE,
-            sell_target=SELL_TARGET, entry_time=time.time(), filled=True,
+            sell_target=SELL_TARGET, entry_time=now, filled=True,
         )
-        self._positions.append(dn_pos)
+        self._open[market.no_token_id] = dn_pos
         self.stats.total_positions += 1
 
+        self.poly.subscribe_bids([market.yes_token_id, market.no_token_id])
+
         total_spent = USDC_PER_SIDE * 2
-        self.stats.last_action = f"BUY BOTH @ Up=${up_ask:.3f} Down=${down_ask:.3f} | {market.question[:35]}"
+        self.stats.last_action = f"BUY BOTH @ Up=${up_ask:.3f} Down=${down_ask:.3f} | {market.question_short}"
         log.info(
             "[S2] BUY BOTH | Up %.1f@$%.3f + Down %.1f@$%.3f = $%.2f | sell@$%.2f | %s",
-            up_qty, up_ask, dn_qty, down_ask, total_spent, SELL_TARGET, market.question[:45],
+            up_qty, up_ask, dn_qty, down_ask, total_spent, SELL_TARGET, market.question_short,
         )
 
     # ------------------------------------------------------------------
     # Check positions
     # ------------------------------------------------------------------
 
-    async def _check_positions(self):
-        now = time.time()
-
-        for pos in self._positions:
-            if pos.status != "open":
-                continue
+    async def _check_positions(self, now: float):
+        open_positions = list(self._open.values())
+        if not open_positions:
+            return
 
-            window_ended = pos.market.window_end and now > pos.market.window_end
-            bid = await self.poly._get_best_bid(pos.token_id)
+        # Streamed bids cover most tokens; one batched request for the rest
+        bids = {}
+        missing = []
+        for p in open_positions:
+            bid = self.poly.streamed_bid(p.token_id)
+            if bid is None:
+                missing.append(p.token_id)
+            else:
+                bids[p.token_id] = bid
+        if missing:
+            bids.update(await self.poly.get_best_bids_batch(missing))
+
+        # Expiries are known in advance: pop due condition_ids off a heap
+        # instead of comparing every position's window_end each tick.
+        expired: Set[str] = set()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expired.add(heapq.heappop(self._expiry_heap)[1])
+
+        closed_pnl = 0.0
+        closed_any = False
+        for pos in open_positions:
+            window_ended = pos.market.condition_id in expired
+            bid = bids.get(pos.token_id)
 
             if bid and bid >= pos.sell_target:
                 # Limit sell hit at $0.60!
@@ -209,12 +285,16 @@ class Strategy2:
                 self.stats.total_pnl += pos.pnl
                 self.stats.daily_pnl += pos.pnl
                 self.stats.wins += 1
-                self._record_hourly_pnl(pos.pnl)
+                closed_pnl += pos.pnl
+                closed_any = True
                 self.stats.last_action = f"SELL {pos.side} @${pos.sell_target:.2f} +${pos.pnl:.2f}"
                 self._closed.append(pos)
+                self._open.pop(pos.token_id, None)
+                self.poly.unsubscribe_bids([pos.token_id])
+                self._drop_open_count(pos.market.condition_id)
                 log.info(
                     "[S2] SELL %s @ $%.2f | PnL: +$%.2f | %s",
-                    pos.side, pos.sell_target, pos.pnl, pos.market.question[:45],
+                    pos.side, pos.sell_target, pos.pnl, pos.market.question_short,
                 )
 
             elif window_ended:
@@ -232,15 +312,36 @@ class Strategy2:
                     self.stats.daily_pnl += pos.pnl
                     self.stats.losses += 1
                 pos.status = "resolved"
-                self._record_hourly_pnl(pos.pnl)
+                closed_pnl += pos.pnl
+                closed_any = True
                 self.stats.last_action = f"RESOLVED {pos.side} ${pos.pnl:+.2f}"
                 self._closed.append(pos)
+                self._open.pop(pos.token_id, None)
+                self.poly.unsubscribe_bids([pos.token_id])
+                self._drop_open_count(pos.market.condition_id)
                 log.info(
                     "[S2] RESOLVED %s @ $%.2f | PnL: $%+.2f | %s",
-                    pos.side, pos.exit_price, pos.pnl, pos.market.question[:45],
+                    pos.side, pos.exit_price, pos.pnl, pos.market.question_short,
                 )
                 continue
 
+        # One hour-key lookup for everything that closed this tick (Up and
+        # Down commonly resolve together at window_end).
+        if closed_any:
+            self._record_hourly_pnl(closed_pnl)
+
+    def _gc_bought_cids(self, now: float):
+        if len(self._bought_cids) < 64:
+            return
+        stale = [cid for cid, exp in self._bought_cids.items() if exp < now]
+        for cid in stale:
+            del self._bought_cids[cid]
+
+    def _drop_open_count(self, cid: str):
+        self._open_per_cid[cid] -= 1
+        if self._open_per_cid[cid] <= 0:
+            del self._open_per_cid[cid]
+
     # ------------------------------------------------------------------
     # Hourly P&L tracking
     # ------------------------------------------------------------------
@@ -250,6 +351,14 @@ class Strategy2:
         self.stats.hourly_pnl[hour_key] = self.stats.hourly_pnl.get(hour_key, 0) + pnl
 
     def _hourly_report(self):
+        # EST offsets are whole hours, so the EST hour key only changes when
+        # the unix hour bucket does — skip the strftime work on the ~1799 of
+        # 1800 ticks per hour where nothing changed.
+        bucket = int(time.time()) // 3600
+        if bucket == self._hour_bucket:
+            return
+        self._hour_bucket = bucket
+
         hour_key = hour_key_est()
         today = date_key_est()
 
@@ -282,8 +391,8 @@ class Strategy2:
 
     @property
     def open_positions(self) -> List[S2Position]:
-        return [p for p in self._positions if p.status == "open"]
+        return list(self._open.values())
 
     @property
-    def closed_positions(self) -> List[S2Position]:
+    def closed_positions(self) -> Deque[S2Position]:
         return self._closed
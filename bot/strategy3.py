@@ -17,14 +17,15 @@ analysis window, the market is chopping and we can't trust either side.
 """
 
 import asyncio
+import collections
+import heapq
 import logging
-import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from bot.time_util import date_key_est, hour_key_est
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Deque
 
 from bot.polymarket import PolymarketClient, Market, Position
 from bot.config import cfg
@@ -44,7 +45,7 @@ S3_SELL_AT_CENTS = 0.97     # take profit: sell when our side reaches 97c or abo
 S3_MAX_BUY_CENTS = 0.94     # don't buy if ask is above 94c
 
 
-@dataclass
+@dataclass(slots=True)
 class S3Stats:
     markets_analyzed: int = 0
     trades: int = 0
@@ -54,12 +55,13 @@ class S3Stats:
     wins: int = 0
     losses: int = 0
     last_action: str = ""
-    hourly_pnl: dict = field(default_factory=dict)
+    # 24 EST hour-of-day buckets; the dashboard formats keys at read time
+    hourly_pnl: list = field(default_factory=lambda: [0.0] * 24)
     last_hour_report: str = ""
     daily_pnl: float = 0.0   # EST day; when >= s3_daily_profit_target_usdc, no new trades until next day
 
 
-@dataclass
+@dataclass(slots=True)
 class S3Position:
     market: Market
     side: str
@@ -72,9 +74,13 @@ class S3Position:
     pnl: Optional[float] = None
     status: str = "open"
     manipulation_detected: bool = False  # when True, hard sell at 30c or below
+    order_id: Optional[str] = None
+    is_up: bool = False       # fixed at buy; avoids per-tick side string compares
+    opp_token: str = ""       # the other outcome's token_id
+    strike: Optional[float] = None  # market reference price, immutable per window
 
 
-@dataclass
+@dataclass(slots=True)
 class S3WindowTracker:
     """Tracks price highs for a window during the analysis period."""
     market: Market
@@ -82,23 +88,71 @@ class S3WindowTracker:
     down_high: float = 0.0    # highest Down price seen during analysis window
     analyzing: bool = False   # are we in the analysis window?
     decision_made: bool = False
+    # Absolute boundary timestamps, derived once from window_end at
+    # discovery so the tick branches compare now against plain scalars.
+    end_ts: float = 0.0
+    analysis_start_ts: float = 0.0
+    buy_start_ts: float = 0.0
+    one_min_ts: float = 0.0
     no_leader_at_1min: bool = False   # at 1 min remaining neither side was 70c+ → don't buy
     checked_no_leader_1min: bool = False  # have we run the 1-min check
 
 
+def _exit_action(our_bid: Optional[float], hard_stop: float, take_profit: float) -> int:
+    """Pure exit kernel for an open position: 0 = hold, 1 = hard stop,
+    2 = take profit. All I/O stays with the caller."""
+    if our_bid is None:
+        return 0
+    if our_bid <= hard_stop:
+        return 1
+    if our_bid >= take_profit:
+        return 2
+    return 0
+
+
+def _manip_detected(up_bid: float, down_bid: float, btc: float, strike: float,
+                    is_up: bool, favor: float) -> bool:
+    """Pure kernel: does the book favor our side while BTC sits on the
+    wrong side of the strike?"""
+    if is_up:
+        return up_bid >= favor and btc < strike
+    return down_bid >= favor and btc > strike
+
+
+def _pick_side(up_now: float, down_now: float, threshold: float) -> Optional[str]:
+    """Pure decision kernel: which side (if any) clears the buy threshold.
+
+    Kept free of I/O and instance state so the comparison logic is easy to
+    test and cheap to call from the tick loop.
+    """
+    if up_now >= threshold and up_now >= down_now:
+        return "Up"
+    if down_now >= threshold and down_now >= up_now:
+        return "Down"
+    return None
+
+
 class Strategy3:
 
     def __init__(self, poly: PolymarketClient, feed=None):
         self.poly = poly
         self.feed = feed  # Binance feed for BTC price (manipulation check)
         self.stats = S3Stats()
-        self._positions: List[S3Position] = []
-        self._closed: List[S3Position] = []
+        self._open: Dict[str, S3Position] = {}          # token_id -> position
+        self._expiry_heap: List[tuple] = []             # (window_end, token_id)
+        self._closed: Deque[S3Position] = collections.deque(maxlen=50)
         self._trackers: Dict[str, S3WindowTracker] = {}
+        self._analysis_heap: List[tuple] = []   # (window_end - ANALYSIS_START, cid)
+        self._active: Dict[str, S3WindowTracker] = {}  # inside analysis window
         self._decided_cids: Set[str] = set()
         self._running = False
         self._last_hour_key = ""
         self._last_day = ""
+        self._hour_bucket = -1  # int(time)//3600; cheap change detector
+        self._last_disc = 0.0           # monotonic; elapsed-time gate only
+        self._disc_interval = 30.0      # backs off to 120 s when quiet
+        self._disc_empty_streak = 0
+        self._tick_bids: Dict[str, Optional[float]] = {}  # per-tick memo
 
     def _allowed_to_trade_now(self) -> bool:
         """True if current time EST is in [start_hour:start_minute, end_hour) and daily profit target not hit."""
@@ -131,62 +185,114 @@ class Strategy3:
                 await self._tick()
             except Exception as exc:
                 log.error("Strategy 3 tick error: %s", exc, exc_info=True)
-            await asyncio.sleep(1)
+            # React to a streamed book update immediately; the timeout only
+            # needs to cover the next scheduled transition (analysis start,
+            # decision point, expiry), so idle stretches sleep longer.
+            self.poly.bid_event.clear()
+            try:
+                await asyncio.wait_for(self.poly.bid_event.wait(),
+                                       timeout=self._next_wake_delay())
+            except asyncio.TimeoutError:
+                pass
 
     def stop(self):
         self._running = False
 
+    def _next_wake_delay(self) -> float:
+        """Seconds until the nearest time-based transition, clamped to
+        [0.05, 1.0]. Book events cut the wait short regardless."""
+        now = time.time()
+        deadline = now + 1.0
+        for tracker in self._trackers.values():
+            for boundary in (tracker.analysis_start_ts, tracker.buy_start_ts,
+                             tracker.one_min_ts, tracker.end_ts):
+                if now < boundary < deadline:
+                    deadline = boundary
+        for window_end, _token in self._expiry_heap[:1]:
+            if now < window_end < deadline:
+                deadline = window_end
+        return max(0.05, deadline - now)
+
     async def _tick(self):
         now = time.time()
+        self._tick_bids.clear()
 
-        # Discover markets
-        if not hasattr(self, "_last_disc") or now - self._last_disc > 30:
+        # Discover markets (monotonic: a wall-clock step must not stall
+        # or double-fire the debounce)
+        mono_now = time.monotonic()
+        if mono_now - self._last_disc > self._disc_interval:
             await self._discover()
-            self._last_disc = now
-
-        # Analyze each tracked window
-        for cid, tracker in list(self._trackers.items()):
-            if tracker.decision_made:
-                continue
-
+            self._last_disc = mono_now
+
+        # Promote trackers whose analysis window has opened; trackers still
+        # waiting cost nothing per tick while they sit on the heap.
+        while self._analysis_heap and self._analysis_heap[0][0] <= now:
+            _, cid = heapq.heappop(self._analysis_heap)
+            tracker = self._trackers.get(cid)
+            if tracker is not None:
+                self._active[cid] = tracker
+
+        # Warm the per-tick memo with one batched /books call for every
+        # active token the stream can't answer, so the branches below don't
+        # each pay their own round-trip.
+        need: List[str] = []
+        for tracker in self._active.values():
+            mkt = tracker.market
+            for token, opp in ((mkt.yes_token_id, mkt.no_token_id),
+                               (mkt.no_token_id, mkt.yes_token_id)):
+                # Mirrored books: the opposite ask stands in for a missing bid
+                bid = self.poly.mirrored_bid(token, opp)
+                if bid is None:
+                    need.append(token)
+                else:
+                    self._tick_bids[token] = bid
+        if need:
+            books = await self.poly.get_books_batch(need)
+            for token, (best_bid, _best_ask) in books.items():
+                self._tick_bids[token] = best_bid
+
+        # Analyze each window currently in play
+        for cid, tracker in list(self._active.items()):
             mkt = tracker.market
-            if not mkt.window_end:
-                continue
-
-            remaining = mkt.window_end - now
 
-            # Window ended, clean up
-            if remaining <= 0:
+            # Window ended, clean up — decided trackers too, or their stream
+            # subscriptions and book state would linger forever.
+            if now >= tracker.end_ts:
                 self._trackers.pop(cid, None)
+                self._active.pop(cid, None)
+                self.poly.unsubscribe_bids([mkt.yes_token_id, mkt.no_token_id])
+                continue
+
+            if tracker.decision_made:
                 continue
 
             # Analysis window: 3:00 to 2:40 remaining (track highs)
-            if remaining <= ANALYSIS_START and remaining > BUY_AT_REMAINING:
+            if tracker.analysis_start_ts <= now < tracker.buy_start_ts:
                 if not tracker.analyzing:
                     tracker.analyzing = True
-                    log.info("S3: Analyzing %s (%.0fs left)", mkt.question[:40], remaining)
+                    log.info("S3: Analyzing %s (%.0fs left)", mkt.question_short, tracker.end_ts - now)
 
-                # Poll both sides and track highs
-                await self.poly.get_market_prices(mkt)
-                if mkt.yes_ask > 0:
-                    # Use ask as proxy for current price
-                    up_price = 1.0 - mkt.no_ask if mkt.no_ask > 0 else mkt.yes_ask
-                    down_price = 1.0 - mkt.yes_ask if mkt.yes_ask > 0 else mkt.no_ask
-                    # Actually, the bid is what we'd pay — let's get bids
-                    up_bid = await self.poly._get_best_bid(mkt.yes_token_id)
-                    down_bid = await self.poly._get_best_bid(mkt.no_token_id)
-
-                    if up_bid and up_bid > tracker.up_high:
-                        tracker.up_high = up_bid
-                    if down_bid and down_bid > tracker.down_high:
-                        tracker.down_high = down_bid
+                # Track highs off the bids — that's what we'd be paid.
+                # Ask data isn't needed until decision time, so skip the
+                # get_market_prices round-trip here.
+                up_bid, down_bid = await asyncio.gather(
+                    self._cached_bid(mkt.yes_token_id),
+                    self._cached_bid(mkt.no_token_id),
+                )
+
+                if up_bid and up_bid > tracker.up_high:
+                    tracker.up_high = up_bid
+                if down_bid and down_bid > tracker.down_high:
+                    tracker.down_high = down_bid
 
             # At 1:00 remaining: if still no side 70c+, give up for this market (don't buy rest of window)
-            if remaining <= SKIP_NO_LEADER_AT and not tracker.checked_no_leader_1min:
+            if now >= tracker.one_min_ts and not tracker.checked_no_leader_1min:
                 tracker.checked_no_leader_1min = True
                 await self.poly.get_market_prices(mkt)
-                up_bid_1m = await self.poly._get_best_bid(mkt.yes_token_id)
-                down_bid_1m = await self.poly._get_best_bid(mkt.no_token_id)
+                up_bid_1m, down_bid_1m = await asyncio.gather(
+                    self._cached_bid(mkt.yes_token_id),
+                    self._cached_bid(mkt.no_token_id),
+                )
                 up_1m = up_bid_1m or 0
                 down_1m = down_bid_1m or 0
                 if up_1m < BUY_THRESHOLD and down_1m < BUY_THRESHOLD:
@@ -194,7 +300,7 @@ class Strategy3:
                     log.info("S3: At 1:00 left neither side 70c+ (Up=%.2f Down=%.2f) → won't buy this market", up_1m, down_1m)
 
             # Buy window: 2:40 remaining or less. Every tick: buy as soon as one side 70c+; or skip if no leader at 1m / choppy
-            if remaining <= BUY_AT_REMAINING and not tracker.decision_made:
+            if now >= tracker.buy_start_ts and not tracker.decision_made:
                 if not self._allowed_to_trade_now():
                     tracker.decision_made = True
                     self._decided_cids.add(cid)
@@ -222,20 +328,18 @@ class Strategy3:
 
                 # Get current prices: buy as soon as one side is 70c+
                 await self.poly.get_market_prices(mkt)
-                up_bid = await self.poly._get_best_bid(mkt.yes_token_id)
-                down_bid = await self.poly._get_best_bid(mkt.no_token_id)
+                up_bid, down_bid = await asyncio.gather(
+                    self._cached_bid(mkt.yes_token_id),
+                    self._cached_bid(mkt.no_token_id),
+                )
                 up_now = up_bid or 0
                 down_now = down_bid or 0
 
-                buy_side = None
-                buy_price = 0
-                buy_token = ""
-                if up_now >= BUY_THRESHOLD and up_now >= down_now:
-                    buy_side = "Up"
+                buy_side = _pick_side(up_now, down_now, BUY_THRESHOLD)
+                if buy_side == "Up":
                     buy_price = up_now
                     buy_token = mkt.yes_token_id
-                elif down_now >= BUY_THRESHOLD and down_now >= up_now:
-                    buy_side = "Down"
+                else:
                     buy_price = down_now
                     buy_token = mkt.no_token_id
 
@@ -252,19 +356,24 @@ class Strategy3:
                     self.stats.markets_analyzed += 1
                     poly_side = "YES" if buy_side == "Up" else "NO"
                     real_pos = await self.poly.buy(mkt, poly_side, cfg.s3_usdc_per_trade)
-                    qty = real_pos.qty or math.floor((cfg.s3_usdc_per_trade / ask) * 100) / 100
+                    # int() truncates the same as floor for positive values
+                    qty = real_pos.qty or int(cfg.s3_usdc_per_trade * 100.0 / ask) * 0.01
                     pos = S3Position(
                         market=mkt, side=buy_side, token_id=buy_token,
                         entry_price=real_pos.avg_entry or ask, qty=qty, spent=cfg.s3_usdc_per_trade,
                         entry_time=time.time(),
+                        is_up=(buy_side == "Up"),
+                        opp_token=mkt.no_token_id if buy_side == "Up" else mkt.yes_token_id,
+                        strike=mkt.reference_price,
                     )
                     pos.order_id = getattr(real_pos, "order_id", None)
-                    self._positions.append(pos)
+                    self._open[pos.token_id] = pos
+                    heapq.heappush(self._expiry_heap, (mkt.window_end, pos.token_id))
                     self.stats.trades += 1
-                    self.stats.last_action = f"BUY {buy_side} @ ${ask:.3f} | {mkt.question[:30]}"
+                    self.stats.last_action = f"BUY {buy_side} @ ${ask:.3f} | {mkt.question_short}"
                     log.info(
                         "[S3] BUY %s %.1f shares @ $%.3f ($%.2f) | %.0fs left | %s",
-                        buy_side, qty, ask, cfg.s3_usdc_per_trade, remaining, mkt.question[:45],
+                        buy_side, qty, ask, cfg.s3_usdc_per_trade, tracker.end_ts - now, mkt.question_short,
                     )
                 # else: no side 70c+ yet, keep waiting (don't set decision_made)
 
@@ -272,6 +381,35 @@ class Strategy3:
         await self._check_positions()
         self._hourly_report()
 
+    async def _cached_bid(self, token_id: str) -> Optional[float]:
+        """Best bid for token_id, fetched at most once per tick.
+
+        The analysis, decision and manipulation branches probe the same
+        tokens within one tick; the memo collapses those into one fetch.
+        """
+        if token_id in self._tick_bids:
+            return self._tick_bids[token_id]
+        # Streamed book data (subscribed at discovery) avoids REST entirely
+        bid = self.poly.streamed_bid(token_id)
+        if bid is None:
+            bid = await self.poly._get_best_bid(token_id)
+        self._tick_bids[token_id] = bid
+        return bid
+
+    async def _position_bid(self, pos: S3Position) -> Optional[float]:
+        """Best bid for a position's token.
+
+        Like _cached_bid, but knows the opposite token so the mirrored
+        book (1 - opposite ask) can stand in when our side's bid is gone.
+        """
+        if pos.token_id in self._tick_bids:
+            return self._tick_bids[pos.token_id]
+        bid = self.poly.mirrored_bid(pos.token_id, pos.opp_token) if pos.opp_token else None
+        if bid is None:
+            return await self._cached_bid(pos.token_id)
+        self._tick_bids[pos.token_id] = bid
+        return bid
+
     async def _s3_sell(self, pos: S3Position) -> bool:
         """Sell an S3 position via Polymarket client. Updates pos.exit_price, pos.pnl, pos.status."""
         p = Position(
@@ -287,12 +425,14 @@ class Strategy3:
             self.stats.total_pnl += pnl_val
             self.stats.daily_pnl += pnl_val
             self._record_hourly_pnl(pnl_val)
+            self._open.pop(pos.token_id, None)
             self._closed.append(pos)
         return sold
 
     async def _discover(self):
         markets = await self.poly.find_active_btc_5min_markets()
         now = time.time()
+        new_trackers = 0
         for mkt in markets:
             cid = mkt.condition_id
             if cid in self._trackers or cid in self._decided_cids:
@@ -301,58 +441,80 @@ class Strategy3:
             if mkt.window_start and mkt.window_end:
                 remaining = mkt.window_end - now
                 if 0 < remaining <= 300:
-                    self._trackers[cid] = S3WindowTracker(market=mkt)
+                    self._trackers[cid] = S3WindowTracker(
+                        market=mkt,
+                        end_ts=mkt.window_end,
+                        analysis_start_ts=mkt.window_end - ANALYSIS_START,
+                        buy_start_ts=mkt.window_end - BUY_AT_REMAINING,
+                        one_min_ts=mkt.window_end - SKIP_NO_LEADER_AT,
+                    )
+                    heapq.heappush(self._analysis_heap, (mkt.window_end - ANALYSIS_START, cid))
+                    self.poly.subscribe_bids([mkt.yes_token_id, mkt.no_token_id])
+                    new_trackers += 1
+
+        # Back off while discovery keeps coming up empty; snap back to the
+        # 30 s cadence as soon as something new lists.
+        if new_trackers:
+            self._disc_empty_streak = 0
+            self._disc_interval = 30.0
+        else:
+            self._disc_empty_streak += 1
+            self._disc_interval = min(120.0, 30.0 * (2 ** min(self._disc_empty_streak, 2)))
 
     async def _check_positions(self):
         now = time.time()
-        for pos in self._positions:
-            if pos.status != "open":
-                continue
-
+        # Manipulation checks need a live BTC price; decide once per tick
+        # instead of probing the feed per position.
+        btc = getattr(self.feed, "current_price", None) if self.feed else None
+        # Early-exit checks only touch open positions; resolution is driven
+        # by the expiry heap below instead of rescanning everything.
+        for pos in list(self._open.values()):
             mkt = pos.market
             # ----- While window open: hard stop 30c, take profit 97c -----
             if mkt.window_end and now < mkt.window_end:
-                our_bid = await self.poly._get_best_bid(pos.token_id)
-                if our_bid is not None:
-                    if our_bid <= S3_HARD_STOP_CENTS:
-                        sold = await self._s3_sell(pos)
-                        if sold:
-                            self.stats.losses += 1
-                            self.stats.last_action = f"S3 HARD STOP {pos.side} @ {our_bid*100:.0f}c"
-                            log.info("[S3] HARD STOP: %s @ %.0fc (sell to avoid liquidation)", pos.side, our_bid * 100)
-                            continue
-                    elif our_bid >= S3_SELL_AT_CENTS:
-                        sold = await self._s3_sell(pos)
-                        if sold:
-                            self.stats.wins += 1
-                            self.stats.last_action = f"S3 SELL {pos.side} @ {our_bid*100:.0f}c (take profit)"
-                            log.info("[S3] SELL %s @ %.0fc (take profit at 97c+)", pos.side, our_bid * 100)
-                            continue
+                our_bid = await self._position_bid(pos)
+                action = _exit_action(our_bid, S3_HARD_STOP_CENTS, S3_SELL_AT_CENTS)
+                if action == 1:
+                    sold = await self._s3_sell(pos)
+                    if sold:
+                        self.stats.losses += 1
+                        self.stats.last_action = f"S3 HARD STOP {pos.side} @ {our_bid*100:.0f}c"
+                        log.info("[S3] HARD STOP: %s @ %.0fc (sell to avoid liquidation)", pos.side, our_bid * 100)
+                        continue
+                elif action == 2:
+                    sold = await self._s3_sell(pos)
+                    if sold:
+                        self.stats.wins += 1
+                        self.stats.last_action = f"S3 SELL {pos.side} @ {our_bid*100:.0f}c (take profit)"
+                        log.info("[S3] SELL %s @ %.0fc (take profit at 97c+)", pos.side, our_bid * 100)
+                        continue
 
             # ----- Manipulation: detect, then hard sell at 30c or below (while window open) -----
-            if mkt.window_end and now < mkt.window_end and self.feed and getattr(self.feed, "current_price", None):
-                btc = self.feed.current_price
-                strike = mkt.reference_price
+            if btc and mkt.window_end and now < mkt.window_end:
+                strike = pos.strike
                 if strike is not None:
-                    up_bid = await self.poly._get_best_bid(mkt.yes_token_id)
-                    down_bid = await self.poly._get_best_bid(mkt.no_token_id)
+                    up_bid, down_bid = await asyncio.gather(
+                        self._cached_bid(mkt.yes_token_id),
+                        self._cached_bid(mkt.no_token_id),
+                    )
                     up_bid = up_bid or 0
                     down_bid = down_bid or 0
-                    # Detect: market favors Up (60c+) but BTC below strike → we're long Up on wrong side
-                    if not pos.manipulation_detected and up_bid >= MANIPULATION_FAVOR_CENTS and btc < strike and pos.side == "Up":
+                    # Detect: book favors our side (60c+) while BTC is on the
+                    # wrong side of the strike → we're long the wrong side
+                    if not pos.manipulation_detected and _manip_detected(
+                            up_bid, down_bid, btc, strike, pos.is_up, MANIPULATION_FAVOR_CENTS):
                         pos.manipulation_detected = True
-                        self.stats.last_action = f"S3 MANIPULATION DETECTED {pos.side} (Up {up_bid:.2f}c but BTC < strike) — hard sell at 30c"
-                        log.info("[S3] MANIPULATION DETECTED: Up favored at %.2fc but BTC $%.0f < strike $%.0f → will hard sell at 30c",
-                                 up_bid * 100, btc, strike)
-                    # Detect: market favors Down (60c+) but BTC above strike → we're long Down on wrong side
-                    elif not pos.manipulation_detected and down_bid >= MANIPULATION_FAVOR_CENTS and btc > strike and pos.side == "Down":
-                        pos.manipulation_detected = True
-                        self.stats.last_action = f"S3 MANIPULATION DETECTED {pos.side} (Down {down_bid:.2f}c but BTC > strike) — hard sell at 30c"
-                        log.info("[S3] MANIPULATION DETECTED: Down favored at %.2fc but BTC $%.0f > strike $%.0f → will hard sell at 30c",
-                                 down_bid * 100, btc, strike)
+                        if pos.is_up:
+                            self.stats.last_action = f"S3 MANIPULATION DETECTED {pos.side} (Up {up_bid:.2f}c but BTC < strike) — hard sell at 30c"
+                            log.info("[S3] MANIPULATION DETECTED: Up favored at %.2fc but BTC $%.0f < strike $%.0f → will hard sell at 30c",
+                                     up_bid * 100, btc, strike)
+                        else:
+                            self.stats.last_action = f"S3 MANIPULATION DETECTED {pos.side} (Down {down_bid:.2f}c but BTC > strike) — hard sell at 30c"
+                            log.info("[S3] MANIPULATION DETECTED: Down favored at %.2fc but BTC $%.0f > strike $%.0f → will hard sell at 30c",
+                                     down_bid * 100, btc, strike)
                     # Hard sell: if manipulation detected and our side is at 30c or less, sell
                     if pos.manipulation_detected:
-                        our_bid = up_bid if pos.side == "Up" else down_bid
+                        our_bid = up_bid if pos.is_up else down_bid
                         if our_bid is not None and our_bid <= MANIPULATION_HARD_SELL_CENTS:
                             sold = await self._s3_sell(pos)
                             if sold:
@@ -361,11 +523,14 @@ class Strategy3:
                                 log.info("[S3] MANIPULATION HARD SELL: %s @ %.0fc (was 30c or below)", pos.side, our_bid * 100)
                                 continue
 
-            if not mkt.window_end or now <= mkt.window_end:
-                continue
+        # Window ended — resolve only the positions whose expiry is due
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, token_id = heapq.heappop(self._expiry_heap)
+            pos = self._open.pop(token_id, None)
+            if pos is None:
+                continue  # already sold before the window closed
 
-            # Window ended — resolve
-            bid = await self.poly._get_best_bid(pos.token_id)
+            bid = await self._position_bid(pos)
             if bid and bid > 0.5:
                 pos.exit_price = 1.0
                 pos.pnl = (1.0 - pos.entry_price) * pos.qty
@@ -383,29 +548,37 @@ class Strategy3:
             self._closed.append(pos)
             log.info(
                 "[S3] RESOLVED %s: $%.2f → PnL $%+.2f | %s",
-                pos.side, pos.exit_price, pos.pnl, pos.market.question[:45],
+                pos.side, pos.exit_price, pos.pnl, pos.market.question_short,
             )
 
     def _record_hourly_pnl(self, pnl: float):
         from bot.pnl_history import append_pnl
 
         hour_key = hour_key_est()
-        self.stats.hourly_pnl[hour_key] = self.stats.hourly_pnl.get(hour_key, 0) + pnl
+        self.stats.hourly_pnl[int(hour_key[:2])] += pnl
         append_pnl(date_key_est(), hour_key, pnl)
 
     def _hourly_report(self):
+        # EST offsets are whole hours, so the hour key only changes when the
+        # unix hour bucket does — skip the strftime work on unchanged ticks.
+        bucket = int(time.time()) // 3600
+        if bucket == self._hour_bucket:
+            return
+        self._hour_bucket = bucket
+
         hour_key = hour_key_est()
         today = date_key_est()
 
         if self._last_day != today:
             if self._last_day:
                 log.info("═══ S3 NEW DAY — resetting hourly P&L and daily P&L ═══")
-            self.stats.hourly_pnl = {}
+            for i in range(24):
+                self.stats.hourly_pnl[i] = 0.0
             self.stats.daily_pnl = 0.0
             self._last_day = today
 
         if hour_key != self._last_hour_key and self._last_hour_key:
-            prev_pnl = self.stats.hourly_pnl.get(self._last_hour_key, 0)
+            prev_pnl = self.stats.hourly_pnl[int(self._last_hour_key[:2])]
             log.info(
                 "═══ S3 HOURLY [%s] ═══  PnL: $%+.2f  |  Total: $%+.2f  |  W:%d L:%d Skip:%d",
                 self._last_hour_key, prev_pnl, self.stats.total_pnl,
@@ -413,14 +586,12 @@ class Strategy3:
                 self.stats.skipped_choppy + self.stats.skipped_no_leader,
             )
 
-        if hour_key not in self.stats.hourly_pnl:
-            self.stats.hourly_pnl[hour_key] = 0.0
         self._last_hour_key = hour_key
 
     @property
     def open_positions(self) -> List[S3Position]:
-        return [p for p in self._positions if p.status == "open"]
+        return list(self._open.values())
 
     @property
-    def closed_positions(self) -> List[S3Position]:
+    def closed_positions(self) -> Deque[S3Position]:
         return self._closed
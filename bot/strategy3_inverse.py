@@ -11,11 +11,12 @@ Logic (all thresholds flipped from S3):
 """
 
 import asyncio
+import collections
 import logging
 import math
 import time
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Deque
 
 from bot.time_util import date_key_est, hour_key_est
 from bot.polymarket import PolymarketClient, Market, Position
@@ -49,7 +50,8 @@ class S3Stats:
     wins: int = 0
     losses: int = 0
     last_action: str = ""
-    hourly_pnl: dict = field(default_factory=dict)
+    # 24 EST hour-of-day buckets, same layout as S3Stats in bot.strategy3
+    hourly_pnl: list = field(default_factory=lambda: [0.0] * 24)
     last_hour_report: str = ""
     daily_pnl: float = 0.0
 
@@ -89,7 +91,7 @@ class Strategy3Inverse:
         self.feed = feed
         self.stats = S3Stats()
         self._positions: List[S3Position] = []
-        self._closed: List[S3Position] = []
+        self._closed: Deque[S3Position] = collections.deque(maxlen=50)
         self._trackers: Dict[str, S3WindowTracker] = {}
         self._decided_cids: Set[str] = set()
         self._running = False
@@ -360,7 +362,7 @@ class Strategy3Inverse:
     def _record_hourly_pnl(self, pnl: float):
         from bot.pnl_history import append_pnl_inverse
         hour_key = hour_key_est()
-        self.stats.hourly_pnl[hour_key] = self.stats.hourly_pnl.get(hour_key, 0) + pnl
+        self.stats.hourly_pnl[int(hour_key[:2])] += pnl
         append_pnl_inverse(date_key_est(), hour_key, pnl)
 
     def _hourly_report(self):
@@ -369,14 +371,13 @@ class Strategy3Inverse:
         if self._last_day != today:
             if self._last_day:
                 log.info("═══ S3inv NEW DAY ═══")
-            self.stats.hourly_pnl = {}
+            for i in range(24):
+                self.stats.hourly_pnl[i] = 0.0
             self.stats.daily_pnl = 0.0
             self._last_day = today
         if hour_key != self._last_hour_key and self._last_hour_key:
-            prev_pnl = self.stats.hourly_pnl.get(self._last_hour_key, 0)
+            prev_pnl = self.stats.hourly_pnl[int(self._last_hour_key[:2])]
             log.info("═══ S3inv HOURLY [%s] PnL $%+.2f | Total $%+.2f | W:%d L:%d", self._last_hour_key, prev_pnl, self.stats.total_pnl, self.stats.wins, self.stats.losses)
-        if hour_key not in self.stats.hourly_pnl:
-            self.stats.hourly_pnl[hour_key] = 0.0
         self._last_hour_key = hour_key
 
     @property
@@ -384,5 +385,5 @@ class Strategy3Inverse:
         return [p for p in self._positions if p.status == "open"]
 
     @property
-    def closed_positions(self) -> List[S3Position]:
+    def closed_positions(self) -> Deque[S3Position]:
         return self._closed
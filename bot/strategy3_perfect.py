@@ -16,12 +16,13 @@ We never touch the original Strategy3; this is a separate, more conservative var
 """
 
 import asyncio
+import collections
 import logging
 import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Deque
 
 from bot.time_util import date_key_est, hour_key_est
 from bot.polymarket import PolymarketClient, Market, Position
@@ -65,7 +66,8 @@ class S3Stats:
     wins: int = 0
     losses: int = 0
     last_action: str = ""
-    hourly_pnl: dict = field(default_factory=dict)
+    # 24 EST hour-of-day buckets, same layout as S3Stats in bot.strategy3
+    hourly_pnl: list = field(default_factory=lambda: [0.0] * 24)
     last_hour_report: str = ""
     daily_pnl: float = 0.0
 
@@ -113,7 +115,7 @@ class Strategy3Perfect:
         self.feed = feed
         self.stats = S3Stats()
         self._positions: List[S3Position] = []
-        self._closed: List[S3Position] = []
+        self._closed: Deque[S3Position] = collections.deque(maxlen=50)
         self._trackers: Dict[str, S3WindowTracker] = {}
         self._decided_cids: Set[str] = set()
         self._running = False
@@ -540,7 +542,7 @@ class Strategy3Perfect:
         from bot.pnl_history import append_pnl
 
         hour_key = hour_key_est()
-        self.stats.hourly_pnl[hour_key] = self.stats.hourly_pnl.get(hour_key, 0.0) + pnl
+        self.stats.hourly_pnl[int(hour_key[:2])] += pnl
         append_pnl(date_key_est(), hour_key, pnl)
 
     def _hourly_report(self):
@@ -549,11 +551,12 @@ class Strategy3Perfect:
         if self._last_day != today:
             if self._last_day:
                 log.info("═══ S3 PERFECT NEW DAY ═══")
-            self.stats.hourly_pnl = {}
+            for i in range(24):
+                self.stats.hourly_pnl[i] = 0.0
             self.stats.daily_pnl = 0.0
             self._last_day = today
         if hour_key != self._last_hour_key and self._last_hour_key:
-            prev_pnl = self.stats.hourly_pnl.get(self._last_hour_key, 0.0)
+            prev_pnl = self.stats.hourly_pnl[int(self._last_hour_key[:2])]
             log.info(
                 "═══ S3 PERFECT HOURLY [%s] PnL $%+.2f | Total $%+.2f | W:%d L:%d",
                 self._last_hour_key,
@@ -562,8 +565,6 @@ class Strategy3Perfect:
                 self.stats.wins,
                 self.stats.losses,
             )
-        if hour_key not in self.stats.hourly_pnl:
-            self.stats.hourly_pnl[hour_key] = 0.0
         self._last_hour_key = hour_key
 
     @property
@@ -571,6 +572,6 @@ class Strategy3Perfect:
         return [p for p in self._positions if p.status == "open"]
 
     @property
-    def closed_positions(self) -> List[S3Position]:
+    def closed_positions(self) -> Deque[S3Position]:
         return self._closed
 
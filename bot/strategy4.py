@@ -7,16 +7,16 @@ Profit per share = 1 - (yes_ask + no_ask). No directional bet.
 """
 
 import asyncio
+import collections
 import logging
-import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from bot.time_util import date_key_est, hour_key_est
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Deque
 
-from bot.polymarket import PolymarketClient, Market
+from bot.polymarket import PolymarketClient, Market, Position
 from bot.config import cfg
 
 log = logging.getLogger("strategy4")
@@ -35,7 +35,8 @@ class S4Stats:
     wins: int = 0  # arb trades are always "wins" when filled
     losses: int = 0
     last_action: str = ""
-    hourly_pnl: dict = field(default_factory=dict)
+    # 24 EST hour-of-day buckets; the dashboard formats keys at read time
+    hourly_pnl: list = field(default_factory=lambda: [0.0] * 24)
     daily_pnl: float = 0.0
 
 
@@ -62,13 +63,14 @@ class Strategy4:
         self.poly = poly
         self.feed = feed  # optional: for resolution display (which side won)
         self.stats = S4Stats()
-        self._positions: List[S4ArbPosition] = []
-        self._closed: List[S4ArbPosition] = []
+        self._open_arbs: Dict[str, S4ArbPosition] = {}  # condition_id -> arb
+        self._closed: Deque[S4ArbPosition] = collections.deque(maxlen=50)
         self._traded_cids: Set[str] = set()
         self._trackers: Dict[str, Market] = {}
         self._running = False
         self._last_hour_key = ""
         self._last_day = ""
+        self._hour_bucket = -1  # int(time)//3600; cheap change detector
         self._last_discovery = 0.0
 
     async def run(self):
@@ -82,23 +84,33 @@ class Strategy4:
                 await self._tick()
             except Exception as exc:
                 log.error("Strategy 4 tick error: %s", exc, exc_info=True)
-            await asyncio.sleep(1)
+            # Wake early on streamed book updates; the timeout keeps the
+            # discovery/resolution cadence when the stream is quiet.
+            self.poly.bid_event.clear()
+            try:
+                await asyncio.wait_for(self.poly.bid_event.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
 
     def stop(self):
         self._running = False
 
     async def _tick(self):
         now = time.time()
-        if now - self._last_discovery > 30:
-            await self._discover()
-            self._last_discovery = now
-
-        for cid, mkt in list(self._trackers.items()):
+        # Elapsed-time gate runs on the monotonic clock (NTP-step safe)
+        mono_now = time.monotonic()
+        if mono_now - self._last_discovery > 30:
+            await self._discover(now)
+            self._last_discovery = mono_now
+
+        # Iterate the live dict and defer removals, instead of copying
+        # every (cid, market) pair into a fresh list each tick.
+        expired: List[str] = []
+        for cid, mkt in self._trackers.items():
             if cid in self._traded_cids:
                 continue
             if not mkt.window_end or now >= mkt.window_end:
-                self._trackers.pop(cid, None)
-                self._traded_cids.discard(cid)
+                expired.append(cid)
                 continue
 
             self.stats.markets_checked += 1
@@ -118,7 +130,8 @@ class Strategy4:
                 continue
 
             # Edge: 1 - total_ask profit per share. Buy equal shares of both.
-            qty = math.floor((USDC_PER_TRADE / total_ask) * 100) / 100
+            # int() truncates the same as floor for positive values
+            qty = int(USDC_PER_TRADE * 100.0 / total_ask) * 0.01
             if qty <= 0:
                 continue
 
@@ -130,18 +143,46 @@ class Strategy4:
                 "[S4] BUY YES @ $%.3f (%.2f shares) = $%.2f  |  BUY NO @ $%.3f (%.2f shares) = $%.2f  |  Total spend $%.2f → receive $%.2f at resolution",
                 yes_ask, qty, spent_yes, no_ask, qty, spent_no, spent_yes + spent_no, qty * 1.0,
             )
-            log.info("[S4] Leg 1: sending BUY YES order now...")
-            pos_yes = await self.poly.buy(mkt, "YES", spent_yes)
-            log.info("[S4] Leg 1 YES filled=%s qty=%s | Leg 2: sending BUY NO order now...", pos_yes.filled, pos_yes.qty)
-            pos_no = await self.poly.buy(mkt, "NO", spent_no)
-            log.info("[S4] Leg 2 NO filled=%s qty=%s", pos_no.filled, pos_no.qty)
-            if not pos_yes.filled or not pos_no.filled:
-                self.stats.last_action = "S4 BUY FAILED (one or both legs)"
+            # Both legs are independent orders — send them concurrently so the
+            # second side can't drift while the first round-trip completes.
+            log.info("[S4] Sending both legs now...")
+            pos_yes, pos_no = await asyncio.gather(
+                self.poly.buy(mkt, "YES", spent_yes),
+                self.poly.buy(mkt, "NO", spent_no),
+                return_exceptions=True,
+            )
+            if isinstance(pos_yes, BaseException):
+                log.error("[S4] YES leg raised: %s", pos_yes)
+                pos_yes = None
+            if isinstance(pos_no, BaseException):
+                log.error("[S4] NO leg raised: %s", pos_no)
+                pos_no = None
+            yes_filled = pos_yes is not None and pos_yes.filled
+            no_filled = pos_no is not None and pos_no.filled
+            log.info("[S4] Legs returned: YES filled=%s NO filled=%s", yes_filled, no_filled)
+            if yes_filled != no_filled:
+                # Half an arb is a directional bet — dump the filled leg now.
+                leg = pos_yes if yes_filled else pos_no
+                side = "YES" if yes_filled else "NO"
+                token = mkt.yes_token_id if yes_filled else mkt.no_token_id
+                bail = Position(market=mkt, side=side, token_id=token,
+                                qty=leg.qty, avg_entry=leg.avg_entry)
+                sold = await self.poly.sell(bail)
+                if sold and bail.pnl is not None:
+                    self.stats.total_pnl += bail.pnl
+                    self.stats.daily_pnl += bail.pnl
+                    self._record_hourly_pnl(bail.pnl)
+                self.stats.losses += 1
+                self.stats.last_action = f"S4 BUY FAILED ({side} leg only — bailed out)"
                 log.warning(
-                    "[S4] One or both legs did not fill! YES filled=%s NO filled=%s — you may have only one side in the market. Check Polymarket. %s",
-                    pos_yes.filled, pos_no.filled, mkt.question[:40],
+                    "[S4] Only the %s leg filled — sold it back (sold=%s) to avoid directional exposure. %s",
+                    side, sold, mkt.question_short,
                 )
                 continue
+            if not yes_filled:
+                self.stats.last_action = "S4 BUY FAILED (both legs)"
+                log.warning("[S4] Neither leg filled. %s", mkt.question_short)
+                continue
 
             # Use actual filled qty (in case of partial fill use the smaller)
             qty_yes = pos_yes.qty
@@ -157,9 +198,9 @@ class Strategy4:
                 no_entry=pos_no.avg_entry,
                 spent_yes=qty_actual * pos_yes.avg_entry,
                 spent_no=qty_actual * pos_no.avg_entry,
-                entry_time=time.time(),
+                entry_time=now,
             )
-            self._positions.append(arb)
+            self._open_arbs[cid] = arb
             self._traded_cids.add(cid)
             self.stats.trades += 1
             edge = 1.0 - (arb.yes_entry + arb.no_entry)
@@ -167,31 +208,30 @@ class Strategy4:
             self.stats.last_action = f"S4 BOUGHT YES @ {arb.yes_entry:.2f} + NO @ {arb.no_entry:.2f} | {arb.qty:.2f} each | spend ${total_spent:.2f} → get ${arb.qty:.2f} | +${edge*arb.qty:.2f}"
             log.info(
                 "[S4] FILLED: YES @ $%.3f (%.2f sh) + NO @ $%.3f (%.2f sh) | spend $%.2f → receive $%.2f | profit $%.2f | %s",
-                arb.yes_entry, arb.qty, arb.no_entry, arb.qty, total_spent, arb.qty, edge * arb.qty, mkt.question[:45],
+                arb.yes_entry, arb.qty, arb.no_entry, arb.qty, total_spent, arb.qty, edge * arb.qty, mkt.question_short,
             )
 
-        await self._check_positions()
+        for cid in expired:
+            self._trackers.pop(cid, None)
+            self._traded_cids.discard(cid)
+
+        await self._check_positions(now)
         self._hourly_report()
 
-    async def _discover(self):
+    async def _discover(self, now: float):
         markets = await self.poly.find_active_btc_5min_markets()
         for mkt in markets:
             cid = mkt.condition_id
             if cid in self._traded_cids:
                 continue
             if mkt.window_start and mkt.window_end:
-                remaining = mkt.window_end - time.time()
+                remaining = mkt.window_end - now
                 if 0 < remaining <= 300:
                     self._trackers[cid] = mkt
 
-    async def _check_positions(self):
-        now = time.time()
-        still_open: List[S4ArbPosition] = []
-        for arb in self._positions:
-            if arb.status != "open":
-                continue
+    async def _check_positions(self, now: float):
+        for cid, arb in list(self._open_arbs.items()):
             if not arb.market.window_end or now < arb.market.window_end:
-                still_open.append(arb)
                 continue
 
             # Resolution: one side pays 1, one pays 0 → we get arb.qty * 1
@@ -230,36 +270,40 @@ class Strategy4:
             )
             log.info(
                 "[S4] RESOLVED | %s | Winning side (%s) paid $1.00, losing side (%s) paid $0.00 | Received $%.2f, spent $%.2f, profit $%+.2f | %s",
-                resolution_msg, winning_side or "?", losing_side or "?", received, total_spent, arb.pnl, arb.market.question[:45],
+                resolution_msg, winning_side or "?", losing_side or "?", received, total_spent, arb.pnl, arb.market.question_short,
             )
-
-        self._positions = still_open
+            del self._open_arbs[cid]
 
     def _record_hourly_pnl(self, pnl: float):
-        hour_key = hour_key_est()
-        self.stats.hourly_pnl[hour_key] = self.stats.hourly_pnl.get(hour_key, 0) + pnl
+        self.stats.hourly_pnl[int(hour_key_est()[:2])] += pnl
 
     def _hourly_report(self):
+        # Skip the strftime work until the unix hour bucket actually rolls
+        # over (EST offsets are whole hours, so the keys can't change sooner).
+        bucket = int(time.time()) // 3600
+        if bucket == self._hour_bucket:
+            return
+        self._hour_bucket = bucket
+
         hour_key = hour_key_est()
         today = date_key_est()
         if self._last_day != today:
             if self._last_day:
                 log.info("═══ S4 NEW DAY — resetting hourly P&L and daily P&L ═══")
-            self.stats.hourly_pnl = {}
+            for i in range(24):
+                self.stats.hourly_pnl[i] = 0.0
             self.stats.daily_pnl = 0.0
             self._last_day = today
         if hour_key != self._last_hour_key and self._last_hour_key:
-            prev = self.stats.hourly_pnl.get(self._last_hour_key, 0)
+            prev = self.stats.hourly_pnl[int(self._last_hour_key[:2])]
             log.info("═══ S4 HOURLY [%s] PnL: $%+.2f | Total: $%+.2f | Trades: %d",
                      self._last_hour_key, prev, self.stats.total_pnl, self.stats.trades)
-        if hour_key not in self.stats.hourly_pnl:
-            self.stats.hourly_pnl[hour_key] = 0.0
         self._last_hour_key = hour_key
 
     @property
     def open_positions(self) -> List[S4ArbPosition]:
-        return [p for p in self._positions if p.status == "open"]
+        return list(self._open_arbs.values())
 
     @property
-    def closed_positions(self) -> List[S4ArbPosition]:
+    def closed_positions(self) -> Deque[S4ArbPosition]:
         return self._closed
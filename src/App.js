@@ -116,7 +116,22 @@ function App() {
       ws.onopen = () => setConnected(true);
       ws.onclose = () => { setConnected(false); timer = setTimeout(connect, 2000); };
       ws.onerror = () => ws.close();
-      ws.onmessage = (e) => { try { setState(JSON.parse(e.data)); } catch {} };
+      ws.onmessage = (e) => {
+        try {
+          const msg = JSON.parse(e.data);
+          setState((prev) => {
+            // Connect snapshot carries the full log as `events`; periodic
+            // broadcasts carry only `new_events` since the last broadcast.
+            // Dedupe by seq — the connect event lands in both.
+            let events = msg.events || prev?.events || [];
+            if (msg.new_events?.length) {
+              const seen = new Set(events.map((ev) => ev.seq));
+              events = [...events, ...msg.new_events.filter((ev) => !seen.has(ev.seq))].slice(-50);
+            }
+            return { ...msg, events };
+          });
+        } catch {}
+      };
     }
     connect();
     return () => { if (wsRef.current) wsRef.current.close(); clearTimeout(timer); };